@@ -2,17 +2,45 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from typing import Any, Callable, Union
 
-from engine.deck import Card
 from engine.game import ObservableState
 
 
+class LazyReason:
+    """
+    A decision reason that is only formatted when read with ``str()``.
+
+    ``fmt`` is either a ``str.format`` template or a callable; ``args`` are
+    passed to it. Agents store one of these in ``last_reason`` so headless
+    runs never pay for formatting text nobody reads.
+    """
+
+    __slots__ = ("fmt", "args")
+
+    def __init__(self, fmt: str | Callable[..., str], *args: Any) -> None:
+        self.fmt = fmt
+        self.args = args
+
+    def __str__(self) -> str:
+        if callable(self.fmt):
+            return self.fmt(*self.args)
+        return self.fmt.format(*self.args)
+
+    def __repr__(self) -> str:
+        return f"LazyReason({str(self)!r})"
+
+
+# What agents leave in last_reason
+Reason = Union[str, LazyReason]
+
+
 class BaseAgent(ABC):
     """Abstract base for all Blackjack agents."""
 
     def __init__(self, player_id: int = 0) -> None:
         self.player_id = player_id
-        self.last_reason: str = ""
+        self.last_reason: Reason = ""
 
     @abstractmethod
     def choose_action(
@@ -1,14 +1,24 @@
 """DNN agent using a trained BriscasMLP-style network for Blackjack action prediction."""
 from __future__ import annotations
 
+import threading
+from collections.abc import Sequence
 from pathlib import Path
 
 import numpy as np
-import torch
-import torch.nn as nn
 
-from agents.base_agent import BaseAgent
-from engine.deck import Card, ALL_CARDS, CARD_INDEX, hand_value, is_soft
+try:
+    import torch
+    import torch.nn as nn
+except ImportError:  # NumPy-only deployment: serve exported .npz weights
+    torch = None
+    nn = None
+
+from agents.base_agent import BaseAgent, LazyReason
+from agents.inference_broker import ForwardFn, InferenceBroker
+from agents.model_registry import registry
+from agents.numpy_mlp import NumpyMLP
+from engine.deck import CardCode, CardView, HandState
 from engine.game import ObservableState
 from engine.rules import ACTION_HIT, ACTION_STAND, ACTION_DOUBLE, ACTION_SPLIT, ALL_ACTIONS
 
@@ -38,52 +48,113 @@ ACTION_DIM = len(ACTION_LIST)   # 4
 STATE_DIM = 192
 
 
+# Offsets of the feature blocks
+_HAND_OFF = 0
+_SEEN_OFF = 52
+_UPCARD_OFF = 104
+_SCALAR_OFF = 156
+_SCALAR_END = 164
+
+
+def _scalar_features(state: ObservableState) -> tuple[float, ...]:
+    hand = HandState(state.player_hand)
+    return (
+        hand.total / 21.0,
+        1.0 if hand.soft else 0.0,
+        1.0 if state.is_first_action else 0.0,
+        state.deck_cards_remaining / 312.0,
+        min(state.bankroll, 10000.0) / 10000.0,
+        min(state.current_bet, 500.0) / 500.0,
+        min(state.round_num, 200.0) / 200.0,
+        1.0 if state.is_split_hand else 0.0,
+    )
+
+
+def _batch_buffer(n: int, out: np.ndarray | None) -> np.ndarray:
+    """Zeroed (n, STATE_DIM) float32 rows: ``out[:n]`` or a new array."""
+    if out is None:
+        return np.zeros((n, STATE_DIM), dtype=np.float32)
+    if out.dtype != np.float32 or out.ndim != 2 or out.shape[1] != STATE_DIM or len(out) < n:
+        raise ValueError(
+            f"out must be a float32 array of shape (>= {n}, {STATE_DIM}), "
+            f"got {out.dtype} {out.shape}"
+        )
+    out = out[:n]
+    out.fill(0.0)
+    return out
+
+
+class SeenCardsMask:
+    """
+    The 52-dim seen-cards bitmask, kept up to date incrementally.
+
+    Seen cards are a CardView over the engine's append-only per-shoe list,
+    so between two decisions of the same shoe only the cards appended since
+    the last update need setting. A different underlying list (new shoe,
+    another table) or a shorter view rebuilds the mask from scratch.
+    """
+
+    __slots__ = ("mask", "_cards", "_count")
+
+    def __init__(self) -> None:
+        self.mask = np.zeros(52, dtype=np.float32)
+        self._cards: list | None = None
+        self._count = 0
+
+    def update(self, seen: Sequence[CardCode]) -> np.ndarray:
+        n = len(seen)
+        cards = seen.base if isinstance(seen, CardView) else None
+        if cards is None or cards is not self._cards or n < self._count:
+            self.mask.fill(0.0)
+            self._cards = cards
+            self._count = 0
+        if n > self._count:
+            new = cards[self._count:n] if cards is not None else list(seen)
+            self.mask[new] = 1.0
+            self._count = n
+        return self.mask
+
+
+def _encode_rows(
+    states: Sequence[ObservableState],
+    out: np.ndarray | None,
+    seen: SeenCardsMask,
+) -> np.ndarray:
+    out = _batch_buffer(len(states), out)
+    rows: list[int] = []
+    cols: list[int] = []
+    for i, state in enumerate(states):
+        hand = state.player_hand
+        rows += [i] * (len(hand) + 1)
+        cols += hand
+        cols.append(_UPCARD_OFF + state.dealer_upcard)
+        out[i, _SEEN_OFF:_UPCARD_OFF] = seen.update(state.seen_cards)
+    out[rows, cols] = 1.0
+    out[:, _SCALAR_OFF:_SCALAR_END] = [_scalar_features(s) for s in states]
+    return out
+
+
 class StateEncoder:
-    """Encode ObservableState into a fixed-size float32 numpy vector."""
+    """
+    Encode ObservableState into a fixed-size float32 numpy vector.
+
+    ``encode_batch`` fills one row per state of a (N, STATE_DIM) buffer.
+    Consecutive states from the same shoe (a game log in order) share the
+    seen-cards mask work: only the newly seen cards are set for each row.
+    """
 
     @classmethod
     def encode(cls, state: ObservableState) -> np.ndarray:
-        vec = np.zeros(STATE_DIM, dtype=np.float32)
-        off = 0
-
-        # Player hand bitmask (52 dims)
-        for card in state.player_hand:
-            idx = CARD_INDEX.get(card)
-            if idx is not None:
-                vec[off + idx] = 1.0
-        off += 52
-
-        # Seen cards bitmask (52 dims)
-        for card in state.seen_cards:
-            idx = CARD_INDEX.get(card)
-            if idx is not None:
-                vec[off + idx] = 1.0
-        off += 52
-
-        # Dealer upcard one-hot (52 dims)
-        idx = CARD_INDEX.get(state.dealer_upcard)
-        if idx is not None:
-            vec[off + idx] = 1.0
-        off += 52
-
-        # Scalar features (4 dims)
-        vec[off] = hand_value(state.player_hand) / 21.0
-        vec[off + 1] = 1.0 if is_soft(state.player_hand) else 0.0
-        vec[off + 2] = 1.0 if state.is_first_action else 0.0
-        vec[off + 3] = state.deck_cards_remaining / 312.0
-        off += 4
-
-        # Context (4 dims)
-        vec[off] = min(state.bankroll, 10000.0) / 10000.0
-        vec[off + 1] = min(state.current_bet, 500.0) / 500.0
-        vec[off + 2] = min(state.round_num, 200.0) / 200.0
-        vec[off + 3] = 1.0 if state.is_split_hand else 0.0
-        off += 4
-
-        # Reserved: off = 164, remaining = 28 → total 192
-        assert off == 164, f"Encoding offset {off} != 164"
-
-        return vec
+        return cls.encode_batch((state,))[0]
+
+    @classmethod
+    def encode_batch(
+        cls,
+        states: Sequence[ObservableState],
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """Encode ``states`` into ``out[:len(states)]`` (allocated if None)."""
+        return _encode_rows(states, out, SeenCardsMask())
 
     @classmethod
     def action_mask(cls, legal_actions: list[str]) -> np.ndarray:
@@ -98,13 +169,34 @@ class StateEncoder:
         return ACTION_LIST[idx]
 
 
+class IncrementalStateEncoder(StateEncoder):
+    """
+    StateEncoder that keeps the seen-cards mask across calls, so encoding a
+    seat's next decision only sets the cards dealt since its last one.
+    States from another shoe or table are still correct (the mask rebuilds).
+    """
+
+    def __init__(self) -> None:
+        self.seen = SeenCardsMask()
+
+    def encode(self, state: ObservableState) -> np.ndarray:
+        return self.encode_batch((state,))[0]
+
+    def encode_batch(
+        self,
+        states: Sequence[ObservableState],
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        return _encode_rows(states, out, self.seen)
+
+
 # ---------------------------------------------------------------------------
 # Neural network
 # ---------------------------------------------------------------------------
 
-class BlackjackMLP(nn.Module):
+class BlackjackMLP(nn.Module if nn is not None else object):
     """
-    MLP for Blackjack action prediction.
+    MLP for Blackjack action prediction (requires torch).
     Input: 192-dim state vector
     Output: 4 logits (hit / stand / double / split)
     """
@@ -137,14 +229,190 @@ class BlackjackMLP(nn.Module):
         return self.net(x)
 
 
+# ---------------------------------------------------------------------------
+# Model loading and shared batched inference
+# ---------------------------------------------------------------------------
+
+def _require_torch() -> None:
+    if torch is None:
+        raise ImportError(
+            "torch is not installed; use weights exported with export_npz "
+            "(a .npz next to the checkpoint) for NumPy inference"
+        )
+
+
+def load_model(model_path: str | Path, device: str = "cpu") -> BlackjackMLP:
+    """Load a BlackjackMLP checkpoint in eval mode."""
+    _require_torch()
+    checkpoint = torch.load(model_path, map_location=torch.device(device))
+    state_dim = checkpoint.get("state_dim", STATE_DIM)
+    action_dim = checkpoint.get("action_dim", ACTION_DIM)
+
+    model = BlackjackMLP(state_dim=state_dim, action_dim=action_dim)
+    model.load_state_dict(checkpoint["model_state_dict"])
+    model.to(device)
+    model.eval()
+    model.requires_grad_(False)
+    return model
+
+
+def fold_batchnorm(model: BlackjackMLP) -> NumpyMLP:
+    """
+    NumPy copy of an eval-mode model with every BatchNorm1d folded into the
+    Linear layer before it: W' = W * s, b' = (b - mean) * s + beta, where
+    s = gamma / sqrt(var + eps).
+    """
+    layers: list[list[np.ndarray]] = []
+    for m in model.net:
+        if isinstance(m, nn.Linear):
+            layers.append([
+                m.weight.detach().cpu().double().numpy(),
+                m.bias.detach().cpu().double().numpy(),
+            ])
+        elif isinstance(m, nn.BatchNorm1d):
+            w, b = layers[-1]
+            scale = (m.weight / torch.sqrt(m.running_var + m.eps)).detach().cpu().double().numpy()
+            mean = m.running_mean.detach().cpu().double().numpy()
+            beta = m.bias.detach().cpu().double().numpy()
+            layers[-1] = [w * scale[:, None], (b - mean) * scale + beta]
+        elif not isinstance(m, (nn.ReLU, nn.Dropout)):
+            raise TypeError(f"cannot export layer {type(m).__name__}")
+    return NumpyMLP([(w.T, b) for w, b in layers])
+
+
+def export_npz(model_path: str | Path, out_path: str | Path | None = None) -> Path:
+    """
+    Export a checkpoint for torch-free inference (BatchNorm folded, float32).
+    Writes next to the checkpoint with a ``.npz`` suffix unless ``out_path``
+    is given; returns the path written.
+    """
+    out = Path(out_path) if out_path is not None else Path(model_path).with_suffix(".npz")
+    fold_batchnorm(load_model(model_path)).save(out)
+    return out
+
+
+def _resolve_weights(model_path: str | Path) -> tuple[str, Path]:
+    """(backend, path): torch for a checkpoint when torch is installed, else the .npz export."""
+    path = Path(model_path)
+    if path.suffix == ".npz":
+        return "numpy", path
+    if torch is None and path.with_suffix(".npz").exists():
+        return "numpy", path.with_suffix(".npz")
+    _require_torch()
+    return "torch", path
+
+
+def weights_available(model_path: str | Path) -> bool:
+    """True if ``model_path`` (or, without torch, its .npz export) can be loaded."""
+    path = Path(model_path)
+    if torch is None and path.suffix != ".npz":
+        path = path.with_suffix(".npz")
+    return path.exists()
+
+
+def get_model(model_path: str | Path, device: str = "cpu") -> BlackjackMLP | NumpyMLP:
+    """
+    The process-wide shared (read-only) model for a checkpoint, loaded once:
+    a BlackjackMLP, or a NumpyMLP for .npz weights / when torch is missing.
+    """
+    backend, path = _resolve_weights(model_path)
+    if backend == "numpy":
+        return registry.get(path, "numpy", NumpyMLP.load)
+    return registry.get(path, f"torch:{device}", lambda p: load_model(p, device))
+
+
+def model_forward(model: BlackjackMLP | NumpyMLP, device: str = "cpu") -> ForwardFn:
+    """Wrap a model as a batch forward function: (N, STATE_DIM) -> (N, ACTION_DIM) logits."""
+    if isinstance(model, NumpyMLP):
+        return model.forward
+    dev = torch.device(device)
+
+    def forward(states: np.ndarray) -> np.ndarray:
+        x = torch.from_numpy(states).to(dev)
+        with torch.no_grad():
+            return model(x).cpu().numpy()
+
+    return forward
+
+
+# Shared brokers, one per (model path, device, batching parameters, backend),
+# with the registry model each one serves
+_brokers: dict[tuple, tuple[BlackjackMLP | NumpyMLP, InferenceBroker]] = {}
+_brokers_lock = threading.Lock()
+
+
+@registry.on_evict
+def _drop_brokers(model: BlackjackMLP | NumpyMLP) -> None:
+    # Forget brokers for an evicted model so it can be freed; agents still
+    # holding one keep using it, and its worker stops once they drop it
+    with _brokers_lock:
+        for key in [k for k, (served, _) in _brokers.items() if served is model]:
+            del _brokers[key]
+
+
+def backend_forward(
+    model: BlackjackMLP | NumpyMLP,
+    backend: str | None = None,
+    device: str = "cpu",
+) -> ForwardFn:
+    """
+    Batch forward function for ``model`` on an inference backend (see
+    agents.dnn_backends): None runs the model as loaded, "auto" picks the
+    fastest backend with decisions identical to the eager model's.
+    """
+    if backend is None:
+        return model_forward(model, device)
+    from agents.dnn_backends import compiled_forward, select_backend
+    if backend == "auto":
+        backend = select_backend(model, device=device)
+    return compiled_forward(model, backend, device)
+
+
+def shared_broker(
+    model_path: str | Path,
+    device: str = "cpu",
+    max_batch_size: int = 64,
+    max_delay_ms: float = 1.0,
+    backend: str | None = None,
+) -> InferenceBroker:
+    """Return the process-wide broker serving ``model_path``, starting it if needed."""
+    key = (str(Path(model_path).resolve()), device, max_batch_size, max_delay_ms, backend)
+    # Outside the lock: loading may evict a model, and the hook takes it
+    model = get_model(model_path, device)
+    with _brokers_lock:
+        served, broker = _brokers.get(key, (None, None))
+        if served is not model:
+            # First use, or the checkpoint changed on disk. The old broker is
+            # not closed: agents holding it keep using it until they drop it.
+            forward = backend_forward(model, backend, device)
+            broker = InferenceBroker(forward, max_batch_size, max_delay_ms)
+            _brokers[key] = (model, broker)
+        return broker
+
+
 # ---------------------------------------------------------------------------
 # DNN Agent
 # ---------------------------------------------------------------------------
 
+def _confidence_reason(action: str, logits: np.ndarray, action_idx: int) -> str:
+    probs = np.exp(logits - logits.max())
+    probs = probs / probs.sum()
+    confidence = int(100 * probs[action_idx])
+    return f"DNN: '{action}' predicted with {confidence}% confidence"
+
+
 class DNNAgent(BaseAgent):
     """
     Agent using a trained BlackjackMLP to predict actions.
     Illegal actions are masked to -inf before argmax.
+
+    Runs the torch model, or the NumPy forward pass for ``.npz`` weights
+    (used automatically when torch is not installed; see export_npz).
+    ``backend`` selects a compiled inference backend instead (see
+    backend_forward).
+
+    With a ``broker`` the agent does not load the model itself: each decision
+    is submitted to the broker and batched with other callers' decisions.
     """
 
     def __init__(
@@ -153,20 +421,16 @@ class DNNAgent(BaseAgent):
         model_path: str | Path = "models/blackjack_mlp.pt",
         device: str = "cpu",
         temperature: float = 1.0,
+        broker: InferenceBroker | None = None,
+        backend: str | None = None,
     ) -> None:
         super().__init__(player_id)
-        self.device = torch.device(device)
+        self.device = device
         self.temperature = temperature
-        self.encoder = StateEncoder()
-
-        checkpoint = torch.load(model_path, map_location=self.device)
-        state_dim = checkpoint.get("state_dim", STATE_DIM)
-        action_dim = checkpoint.get("action_dim", ACTION_DIM)
-
-        self.model = BlackjackMLP(state_dim=state_dim, action_dim=action_dim)
-        self.model.load_state_dict(checkpoint["model_state_dict"])
-        self.model.to(self.device)
-        self.model.eval()
+        self.encoder = IncrementalStateEncoder()
+        self.broker = broker
+        self.model = None if broker is not None else get_model(model_path, device)
+        self._forward = None if broker is not None else backend_forward(self.model, backend, device)
 
     def name(self) -> str:
         return "DNN"
@@ -179,17 +443,15 @@ class DNNAgent(BaseAgent):
         state_vec = self.encoder.encode(state)
         mask = self.encoder.action_mask(legal_actions)
 
-        x = torch.tensor(state_vec, dtype=torch.float32).unsqueeze(0).to(self.device)
-        with torch.no_grad():
-            logits = self.model(x).squeeze(0).cpu().numpy()
+        if self.broker is not None:
+            logits = self.broker.infer(state_vec)
+        else:
+            logits = self._forward(state_vec[None])[0]
 
         logits[~mask] = -1e9
         logits = logits / max(self.temperature, 1e-8)
 
         action_idx = int(np.argmax(logits))
-        probs = np.exp(logits - logits.max())
-        probs = probs / probs.sum()
-        confidence = int(100 * probs[action_idx])
         action = self.encoder.decode_action(action_idx)
-        self.last_reason = f"DNN: '{action}' predicted with {confidence}% confidence"
+        self.last_reason = LazyReason(_confidence_reason, action, logits, action_idx)
         return action
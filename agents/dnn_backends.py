@@ -0,0 +1,278 @@
+"""
+Compiled inference backends for BlackjackMLP.
+
+Every backend turns a loaded eval-mode model into a batch forward function
+((N, STATE_DIM) float32 -> (N, ACTION_DIM) logits), so DNNAgent and the
+inference broker can run any of them:
+
+    eager        the nn.Sequential as loaded (reference)
+    torchscript  traced, frozen and optimized for inference
+    onnx         exported to ONNX, run by ONNX Runtime on CPU
+    int8         dynamically quantized int8 Linear layers (CPU)
+    numpy        BatchNorm folded, pure NumPy (see agents.numpy_mlp)
+
+A compiled backend is only used after a parity check: its masked argmax
+must match the eager model's on a reference set of states recorded from
+real play. ``select_backend`` picks the fastest backend that passes.
+torchscript / int8 need torch; onnx also needs onnx and onnxruntime.
+
+Usage:
+    forward = compiled_forward(model, "onnx")      # raises if parity fails
+    name = select_backend(model)                   # fastest identical backend
+"""
+from __future__ import annotations
+
+import io
+import threading
+import time
+import weakref
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import numpy as np
+
+from agents.inference_broker import ForwardFn
+from agents.model_registry import registry
+
+BACKEND_EAGER = "eager"
+BACKEND_TORCHSCRIPT = "torchscript"
+BACKEND_ONNX = "onnx"
+BACKEND_INT8 = "int8"
+BACKEND_NUMPY = "numpy"
+BACKENDS = (BACKEND_EAGER, BACKEND_TORCHSCRIPT, BACKEND_ONNX, BACKEND_INT8, BACKEND_NUMPY)
+
+# Number of recorded decisions in the parity reference set
+REFERENCE_SIZE = 2000
+
+
+@dataclass(frozen=True)
+class ParityReport:
+    """How a backend's decisions compare with the eager model's."""
+    backend: str
+    n_states: int
+    mismatches: int
+    max_logit_diff: float
+
+    @property
+    def identical(self) -> bool:
+        return self.mismatches == 0
+
+
+# ---------------------------------------------------------------------------
+# Building backends
+# ---------------------------------------------------------------------------
+
+def _torchscript(model) -> ForwardFn:
+    import torch
+
+    from agents.dnn_agent import STATE_DIM, model_forward
+    example = torch.zeros(1, STATE_DIM)
+    with torch.no_grad():
+        traced = torch.jit.trace(model, example)
+        traced = torch.jit.optimize_for_inference(torch.jit.freeze(traced))
+    return model_forward(traced)
+
+
+def _onnx(model) -> ForwardFn:
+    import onnxruntime as ort
+    import torch
+
+    from agents.dnn_agent import STATE_DIM
+    buf = io.BytesIO()
+    torch.onnx.export(
+        model,
+        torch.zeros(1, STATE_DIM),
+        buf,
+        input_names=["state"],
+        output_names=["logits"],
+        dynamic_axes={"state": {0: "batch"}, "logits": {0: "batch"}},
+    )
+    session = ort.InferenceSession(buf.getvalue(), providers=["CPUExecutionProvider"])
+
+    def forward(states: np.ndarray) -> np.ndarray:
+        return session.run(None, {"state": states})[0]
+
+    return forward
+
+
+def _int8(model) -> ForwardFn:
+    import copy
+
+    import torch
+
+    from agents.dnn_agent import model_forward
+    quantized = torch.ao.quantization.quantize_dynamic(
+        copy.deepcopy(model), {torch.nn.Linear}, dtype=torch.qint8
+    )
+    return model_forward(quantized)
+
+
+def build_backend(model, backend: str, device: str = "cpu") -> ForwardFn:
+    """Compile ``model`` for ``backend`` without a parity check."""
+    from agents.dnn_agent import fold_batchnorm, model_forward
+    from agents.numpy_mlp import NumpyMLP
+
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+    if isinstance(model, NumpyMLP):
+        if backend not in (BACKEND_EAGER, BACKEND_NUMPY):
+            raise ValueError(f"NumPy weights only support the '{BACKEND_NUMPY}' backend")
+        return model.forward
+    if backend == BACKEND_EAGER:
+        return model_forward(model, device)
+    if backend == BACKEND_NUMPY:
+        return fold_batchnorm(model).forward
+    if device != "cpu":
+        raise ValueError(f"the '{backend}' backend runs on CPU only")
+    if backend == BACKEND_TORCHSCRIPT:
+        return _torchscript(model)
+    if backend == BACKEND_ONNX:
+        return _onnx(model)
+    return _int8(model)
+
+
+# ---------------------------------------------------------------------------
+# Parity check
+# ---------------------------------------------------------------------------
+
+_reference: tuple[np.ndarray, np.ndarray] | None = None
+_reference_lock = threading.Lock()
+
+
+def reference_states(n: int = REFERENCE_SIZE, seed: int = 0) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (states, legal masks) for ``n`` decisions recorded from seeded games
+    between basic-strategy, aggressive and random players.
+    """
+    from agents.base_agent import BaseAgent
+    from agents.dnn_agent import StateEncoder
+    from agents.heuristic_agent import HeuristicAgent
+    from agents.random_agent import RandomAgent
+    from engine.multi_game import RECORD_AGGREGATES, MultiAgentGame
+
+    states: list = []
+    masks: list[np.ndarray] = []
+
+    class _Recorder(BaseAgent):
+        def __init__(self, inner: BaseAgent) -> None:
+            super().__init__(inner.player_id)
+            self.inner = inner
+
+        def name(self) -> str:
+            return self.inner.name()
+
+        def choose_action(self, state, legal_actions: list[str]) -> str:
+            states.append(state)
+            masks.append(StateEncoder.action_mask(legal_actions))
+            return self.inner.choose_action(state, legal_actions)
+
+    agents = [
+        _Recorder(HeuristicAgent(mode="basic")),
+        _Recorder(HeuristicAgent(mode="aggressive")),
+        _Recorder(RandomAgent(seed=seed)),
+    ]
+    while len(states) < n:
+        MultiAgentGame(agents=agents, num_rounds=200, starting_bankroll=1e9,
+                       seed=seed + len(states), record_level=RECORD_AGGREGATES).run()
+    return StateEncoder.encode_batch(states[:n]), np.stack(masks[:n])
+
+
+def _default_reference() -> tuple[np.ndarray, np.ndarray]:
+    global _reference
+    with _reference_lock:
+        if _reference is None:
+            _reference = reference_states()
+        return _reference
+
+
+def _decisions(forward: ForwardFn, states: np.ndarray, masks: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    logits = np.asarray(forward(states), dtype=np.float32)
+    return np.where(masks, logits, -np.inf).argmax(axis=1), logits
+
+
+def check_parity(
+    model,
+    forward: ForwardFn,
+    backend: str = "",
+    reference: tuple[np.ndarray, np.ndarray] | None = None,
+    device: str = "cpu",
+) -> ParityReport:
+    """Compare ``forward``'s masked argmax with the eager model's."""
+    states, masks = reference if reference is not None else _default_reference()
+    eager = build_backend(model, BACKEND_EAGER, device)
+    want, want_logits = _decisions(eager, states, masks)
+    got, got_logits = _decisions(forward, states, masks)
+    return ParityReport(
+        backend=backend,
+        n_states=len(states),
+        mismatches=int((want != got).sum()),
+        max_logit_diff=float(np.abs(want_logits - got_logits).max()),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Cached, verified backends
+# ---------------------------------------------------------------------------
+
+# model -> {(backend, device): forward}. Entries go when the registry evicts
+# the model (or the model is otherwise freed), whatever the forwards capture.
+_compiled: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_compiled_lock = threading.Lock()
+
+
+@registry.on_evict
+def _drop_compiled(model) -> None:
+    with _compiled_lock:
+        _compiled.pop(model, None)
+
+
+def compiled_forward(model, backend: str, device: str = "cpu") -> ForwardFn:
+    """
+    The forward function for ``model`` on ``backend``, compiled once per
+    model. Raises ValueError if its decisions differ from the eager model's
+    on the reference set.
+    """
+    from agents.numpy_mlp import NumpyMLP
+
+    if backend == BACKEND_EAGER or (isinstance(model, NumpyMLP) and backend == BACKEND_NUMPY):
+        return build_backend(model, backend, device)     # the model itself
+    with _compiled_lock:
+        per_model = _compiled.setdefault(model, {})
+        forward = per_model.get((backend, device))
+        if forward is None:
+            forward = build_backend(model, backend, device)
+            report = check_parity(model, forward, backend, device=device)
+            if not report.identical:
+                raise ValueError(
+                    f"'{backend}' backend changes {report.mismatches} of "
+                    f"{report.n_states} reference decisions"
+                )
+            per_model[(backend, device)] = forward
+        return forward
+
+
+def select_backend(model, candidates: Sequence[str] = BACKENDS, device: str = "cpu") -> str:
+    """
+    The fastest of ``candidates`` that is installed and decides identically
+    to the eager model, timed on single-state calls (the agent's workload).
+    """
+    from agents.numpy_mlp import NumpyMLP
+
+    if isinstance(model, NumpyMLP):
+        return BACKEND_NUMPY
+    states, _ = _default_reference()
+    one = states[:1]
+    best, best_time = BACKEND_EAGER, float("inf")
+    for backend in candidates:
+        try:
+            forward = compiled_forward(model, backend, device)
+        except (ImportError, ValueError, RuntimeError):
+            continue                            # not installed, unsupported or not identical
+        forward(one)                            # warm up
+        start = time.perf_counter()
+        for _ in range(200):
+            forward(one)
+        elapsed = time.perf_counter() - start
+        if elapsed < best_time:
+            best, best_time = backend, elapsed
+    return best
@@ -0,0 +1,191 @@
+"""
+Expectimax agent: approximate EV by combinatorial analysis.
+
+Computes the expected value of every legal action over the current shoe
+composition and plays the best one. The player's draws deplete the shoe
+exactly, but two simplifications make the result an approximation rather
+than the exact EV:
+- The dealer's outcome distribution (engine.dealer's finite-shoe tables,
+  conditioned on the dealer not holding a natural) is computed once from
+  the composition at the decision and reused for every line below it, so
+  the cards the player goes on to draw never change the dealer's odds.
+- Split EV plays each hand from the composition left after the split,
+  ignoring how the two hands deplete the shoe for each other.
+
+Rules follow the engine: no resplit, no double after split, split hands are
+played on (including split Aces), and a two-card 21 on a split hand pays as
+a natural.
+"""
+from __future__ import annotations
+
+from agents.base_agent import BaseAgent, LazyReason
+from engine.dealer import CARD_VALUES, dealer_outcomes, stand_ev, value_counts
+from engine.deck import VALUE_OF, HandState
+from engine.game import ObservableState
+from engine.rules import (
+    ACTION_DOUBLE,
+    ACTION_HIT,
+    ACTION_SPLIT,
+    ACTION_STAND,
+)
+
+# Transposition-table entries kept before the table is cleared
+_TT_LIMIT = 1 << 18
+
+
+def _add_card(total: int, soft: int, value: int) -> tuple[int, int]:
+    """Add a card value to (total, soft aces counted as 11)."""
+    total += value
+    soft += value == 11
+    while total > 21 and soft:
+        total -= 10
+        soft -= 1
+    return total, soft
+
+
+def _without(counts: tuple[int, ...], i: int) -> tuple[int, ...]:
+    return counts[:i] + (counts[i] - 1,) + counts[i + 1:]
+
+
+def _ev_reason(best: str, evs: dict[str, float]) -> str:
+    return f"EV: '{best}' " + ", ".join(f"{a} {ev:+.3f}" for a, ev in evs.items())
+
+
+class ExpectimaxAgent(BaseAgent):
+    """
+    Plays the action with the highest expected value (approximate: see the
+    module docstring).
+
+    EVs are per unit of the current bet. Hand values are memoized in a
+    transposition table keyed on (upcard, dealer table) and then (player
+    total, soft, remaining per-value counts); the player's hand composition
+    is implied by the counts. The dealer table is computed once per
+    decision, for the decision's composition, and reused for every line
+    below it.
+    """
+
+    def __init__(
+        self,
+        player_id: int = 0,
+        soft17_hit: bool = True,
+        blackjack_pays: float = 1.5,
+    ) -> None:
+        super().__init__(player_id)
+        self.soft17_hit = soft17_hit
+        self.blackjack_pays = blackjack_pays
+        # (upcard, dealer table) -> {(total, soft, counts): value}
+        self._tt: dict[tuple, dict[tuple, float]] = {}
+        self._table: dict[tuple, float] = {}
+        self._stand: list[float] = []
+
+    def name(self) -> str:
+        return "Expectimax"
+
+    def reset(self) -> None:
+        super().reset()
+        self._tt.clear()
+
+    def choose_action(
+        self,
+        state: ObservableState,
+        legal_actions: list[str],
+    ) -> str:
+        evs = self.action_values(state, legal_actions)
+        best = max(legal_actions, key=lambda a: evs[a])
+        self.last_reason = LazyReason(_ev_reason, best, evs)
+        return best
+
+    def action_values(
+        self,
+        state: ObservableState,
+        legal_actions: list[str],
+    ) -> dict[str, float]:
+        """EV of each legal action, per unit of the current bet."""
+        if sum(map(len, self._tt.values())) > _TT_LIMIT:
+            self._tt.clear()
+
+        up = VALUE_OF[state.dealer_upcard]
+        counts = value_counts(state.unseen_counts())
+        hand = HandState(state.player_hand)
+        total, soft = hand.total, int(hand.soft)
+        dealer = dealer_outcomes(
+            up, counts, self.soft17_hit, exact=True, no_blackjack=True
+        )
+        # Stand EV by player total, 0..21
+        self._stand = [stand_ev(t, dealer) for t in range(22)]
+        self._table = self._tt.setdefault((up, dealer), {})
+
+        evs: dict[str, float] = {}
+        for action in legal_actions:
+            if action == ACTION_STAND:
+                if hand.is_blackjack:
+                    # Only reachable on a split hand; the engine pays it as a natural
+                    evs[action] = self.blackjack_pays
+                else:
+                    evs[action] = self._stand[total]
+            elif action == ACTION_HIT:
+                evs[action] = self._hit(total, soft, counts)
+            elif action == ACTION_DOUBLE:
+                evs[action] = self._double(total, soft, counts)
+            elif action == ACTION_SPLIT:
+                evs[action] = self._split(VALUE_OF[hand[0]], counts)
+        return evs
+
+    # ------------------------------------------------------------------
+    # Expectimax over the player's draws
+    # ------------------------------------------------------------------
+
+    def _best(self, total: int, soft: int, counts: tuple[int, ...]) -> float:
+        """Value of a hand that may still hit or stand."""
+        if total > 21:
+            return -1.0
+        key = (total, soft, counts)
+        value = self._table.get(key)
+        if value is None:
+            value = self._stand[total]
+            if total < 21:
+                value = max(value, self._hit(total, soft, counts))
+            self._table[key] = value
+        return value
+
+    def _hit(self, total: int, soft: int, counts: tuple[int, ...]) -> float:
+        n = sum(counts)
+        if n == 0:
+            return self._stand[total]
+        ev = 0.0
+        for i, c in enumerate(counts):
+            if c:
+                t, s = _add_card(total, soft, CARD_VALUES[i])
+                if t > 21:
+                    ev -= c
+                else:
+                    ev += c * self._best(t, s, _without(counts, i))
+        return ev / n
+
+    def _double(self, total: int, soft: int, counts: tuple[int, ...]) -> float:
+        n = sum(counts)
+        if n == 0:
+            return 2.0 * self._stand[total]
+        ev = 0.0
+        for i, c in enumerate(counts):
+            if c:
+                t, _ = _add_card(total, soft, CARD_VALUES[i])
+                ev += c * (-1.0 if t > 21 else self._stand[t])
+        return 2.0 * ev / n
+
+    def _split(self, card_value: int, counts: tuple[int, ...]) -> float:
+        # Each split hand: the pair card plus one draw, then hit/stand only
+        n = sum(counts)
+        if n == 0:
+            return 0.0
+        start = _add_card(0, 0, card_value)
+        ev = 0.0
+        for i, c in enumerate(counts):
+            if c:
+                t, s = _add_card(*start, CARD_VALUES[i])
+                if t == 21:
+                    value = self.blackjack_pays
+                else:
+                    value = self._best(t, s, _without(counts, i))
+                ev += c * value
+        return 2.0 * ev / n
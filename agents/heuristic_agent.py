@@ -7,23 +7,44 @@ combination, based on millions of simulated hands.
 Two modes:
   - "basic":      Follow standard basic strategy tables exactly
   - "aggressive": Always try to reach 17+; double/split more liberally
+
+Basic mode follows the built-in 6-deck / H17 / 3:2 chart. Pass ``rules``
+(the game's rule set) to play the table generated for it instead (see
+strategy_table); the API and ParallelTournament do.
 """
 from __future__ import annotations
 
-from engine.deck import hand_value, is_soft
+from array import array
+from typing import Callable
+
+from engine.deck import (
+    ACE_RANK,
+    IS_ACE,
+    NUM_RANKS,
+    RANK_OF,
+    RANKS,
+    VALUE_OF,
+    CardCode,
+    HandState,
+    hand_value,
+    is_soft,
+)
 from engine.game import ObservableState
 from engine.rules import (
+    ACTION_CODE,
     ACTION_DOUBLE,
     ACTION_HIT,
     ACTION_SPLIT,
     ACTION_STAND,
+    ALL_ACTIONS,
 )
-from agents.base_agent import BaseAgent
+from agents.base_agent import BaseAgent, LazyReason
+from agents.strategy_table import RuleSet, StrategyTable, load_strategy
 
 
 def _dealer_up(state: ObservableState) -> int:
     """Dealer upcard value, treating Ace as 11."""
-    return state.dealer_upcard.value()
+    return VALUE_OF[state.dealer_upcard]
 
 
 def _basic_strategy(
@@ -41,9 +62,9 @@ def _basic_strategy(
     soft = is_soft(player_hand)
     pair = (
         len(player_hand) == 2
-        and player_hand[0].rank == player_hand[1].rank
+        and RANK_OF[player_hand[0]] == RANK_OF[player_hand[1]]
     )
-    rank = player_hand[0].rank if pair else None
+    rank = RANKS[RANK_OF[player_hand[0]]] if pair else None
 
     # --- PAIR SPLITTING ---
     if pair and can_split and ACTION_SPLIT in legal_actions:
@@ -132,19 +153,156 @@ def _basic_strategy(
     return ACTION_HIT, f"hard {val}: hit (low total)"
 
 
+# ---------------------------------------------------------------------------
+# Compiled strategy
+# ---------------------------------------------------------------------------
+
+_HARD, _SOFT, _PAIR = 0, 1, 2
+_ROWS = 22   # player totals 0..21; pair rows are rank indices
+_COLS = 12   # dealer upcard values 0..11 (2..11 used)
+
+# decide(player_hand, dealer_up, can_double, can_split) -> (action, reason)
+DecideFn = Callable[[list[CardCode], int, bool, bool], "tuple[str, str]"]
+
+
+def _slot(kind: int, row: int, dealer_up: int, can_double: bool) -> int:
+    return ((kind * _ROWS + row) * _COLS + dealer_up) * 2 + can_double
+
+
+def _code_of_value(value: int) -> CardCode:
+    return ACE_RANK if value == 11 else VALUE_OF.index(value)
+
+
+def _hard_hand(total: int) -> list[CardCode]:
+    """A non-soft hand with the given total (4..21)."""
+    if total <= 11:
+        values = [2, total - 2]
+    elif total <= 19:
+        values = [10, total - 10]
+    else:
+        values = [10, total - 12, 2]
+    return [_code_of_value(v) for v in values]
+
+
+class _CompiledStrategy:
+    """
+    A strategy evaluated once for every (hard/soft/pair, total or pair
+    rank, upcard, can_double) into dense arrays of action codes and
+    interned reason strings; deciding is then an index computation and
+    two array reads. Pair slots hold -1 where the hand is not split.
+    """
+
+    __slots__ = ("codes", "reasons")
+
+    def __init__(self, decide: DecideFn) -> None:
+        size = 3 * _ROWS * _COLS * 2
+        self.codes = array("b", [-1]) * size
+        self.reasons: list[str] = [""] * size
+        interned: dict[str, str] = {}
+
+        def put(i: int, action: str, reason: str) -> None:
+            self.codes[i] = ACTION_CODE[action]
+            self.reasons[i] = interned.setdefault(reason, reason)
+
+        for up in range(2, 12):
+            for can_double in (False, True):
+                for total in range(4, 22):
+                    action, reason = decide(_hard_hand(total), up, can_double, False)
+                    put(_slot(_HARD, total, up, can_double), action, reason)
+                for total in range(12, 22):
+                    hand = [ACE_RANK, _code_of_value(total - 11 if total > 12 else 11)]
+                    action, reason = decide(hand, up, can_double, False)
+                    put(_slot(_SOFT, total, up, can_double), action, reason)
+                for rank in range(NUM_RANKS):
+                    action, reason = decide([rank, rank], up, can_double, True)
+                    if action == ACTION_SPLIT:
+                        put(_slot(_PAIR, rank, up, can_double), action, reason)
+
+    def lookup(
+        self,
+        hand: tuple[CardCode, ...],
+        dealer_up: int,
+        can_double: bool,
+        can_split: bool,
+    ) -> tuple[str, str]:
+        # Inlined _slot(): ((kind * _ROWS + row) * _COLS + up) * 2 + can_double
+        col = dealer_up * 2 + can_double
+        if can_split and len(hand) == 2 and RANK_OF[hand[0]] == RANK_OF[hand[1]]:
+            i = ((_PAIR * _ROWS + RANK_OF[hand[0]]) * _COLS) * 2 + col
+            code = self.codes[i]
+            if code >= 0:
+                return ALL_ACTIONS[code], self.reasons[i]
+        hard = 0
+        aces = 0
+        for c in hand:
+            if IS_ACE[c]:
+                aces += 1
+                hard += 1
+            else:
+                hard += VALUE_OF[c]
+        if aces and hard <= 11:
+            i = ((_SOFT * _ROWS + hard + 10) * _COLS) * 2 + col
+        else:
+            i = (hard * _COLS) * 2 + col
+        return ALL_ACTIONS[self.codes[i]], self.reasons[i]
+
+
+def _decide_basic(
+    hand: list[CardCode], dealer_up: int, can_double: bool, can_split: bool
+) -> tuple[str, str]:
+    legal = [ACTION_HIT, ACTION_STAND]
+    if can_double:
+        legal.append(ACTION_DOUBLE)
+    if can_split:
+        legal.append(ACTION_SPLIT)
+    return _basic_strategy(hand, dealer_up, legal, can_split=can_split, can_double=can_double)
+
+
+_BASIC = _CompiledStrategy(_decide_basic)
+_compiled_tables: dict[RuleSet, _CompiledStrategy] = {}
+
+
+def _compile_table(table: StrategyTable) -> _CompiledStrategy:
+    compiled = _compiled_tables.get(table.rules)
+    if compiled is None:
+        compiled = _compiled_tables[table.rules] = _CompiledStrategy(
+            lambda hand, up, can_double, can_split: table.decide(
+                HandState(hand), up, can_double, can_split
+            )
+        )
+    return compiled
+
+
 class HeuristicAgent(BaseAgent):
     """
     Basic strategy agent with two modes.
 
     basic:      Follows standard casino basic strategy exactly.
     aggressive: Hits until 17+, doubles on 10/11, always splits Aces/8s.
+
+    ``rules`` loads the generated strategy table for that rule set at
+    construction (basic mode only; aggressive mode ignores it, so callers
+    can pass the game's rules to any HeuristicAgent). Common rule sets ship
+    precomputed; any other is generated on first use per machine (a few
+    seconds) into the user cache directory.
     """
 
-    def __init__(self, player_id: int = 0, mode: str = "basic") -> None:
+    def __init__(
+        self,
+        player_id: int = 0,
+        mode: str = "basic",
+        rules: RuleSet | None = None,
+    ) -> None:
         if mode not in ("basic", "aggressive"):
             raise ValueError(f"mode must be 'basic' or 'aggressive', got '{mode}'")
         super().__init__(player_id)
         self.mode = mode
+        self.rules = rules
+        self._strategy = (
+            _compile_table(load_strategy(rules))
+            if rules is not None and mode == "basic"
+            else _BASIC
+        )
 
     def name(self) -> str:
         return f"Heuristic({self.mode})"
@@ -159,19 +317,16 @@ class HeuristicAgent(BaseAgent):
         return self._aggressive(state, legal_actions)
 
     def _basic(self, state: ObservableState, legal_actions: list[str]) -> str:
-        can_split = ACTION_SPLIT in legal_actions
-        can_double = ACTION_DOUBLE in legal_actions
-        action, reason = _basic_strategy(
+        action, reason = self._strategy.lookup(
             state.player_hand,
-            _dealer_up(state),
-            legal_actions,
-            can_split=can_split,
-            can_double=can_double,
+            VALUE_OF[state.dealer_upcard],
+            can_double=ACTION_DOUBLE in legal_actions,
+            can_split=ACTION_SPLIT in legal_actions,
         )
         # Ensure action is legal
         if action not in legal_actions:
             action = ACTION_HIT if ACTION_HIT in legal_actions else ACTION_STAND
-            reason += " (fallback)"
+            reason = LazyReason("{} (fallback)", reason)
         self.last_reason = reason
         return action
 
@@ -183,22 +338,22 @@ class HeuristicAgent(BaseAgent):
         if (
             ACTION_SPLIT in legal_actions
             and len(state.player_hand) == 2
-            and state.player_hand[0].rank == state.player_hand[1].rank
+            and RANK_OF[state.player_hand[0]] == RANK_OF[state.player_hand[1]]
         ):
-            rank = state.player_hand[0].rank
+            rank = RANKS[RANK_OF[state.player_hand[0]]]
             if rank in ("A", "8"):
-                self.last_reason = f"aggressive: always split {rank}s"
+                self.last_reason = LazyReason("aggressive: always split {}s", rank)
                 return ACTION_SPLIT
 
         # Double on 10 or 11
         if ACTION_DOUBLE in legal_actions and val in (10, 11):
-            self.last_reason = f"aggressive: double on {val}"
+            self.last_reason = LazyReason("aggressive: double on {}", val)
             return ACTION_DOUBLE
 
         # Hit until 17+
         if val < 17:
-            self.last_reason = f"aggressive: hit on {val} (target 17+)"
+            self.last_reason = LazyReason("aggressive: hit on {} (target 17+)", val)
             return ACTION_HIT
 
-        self.last_reason = f"aggressive: stand on {val}"
+        self.last_reason = LazyReason("aggressive: stand on {}", val)
         return ACTION_STAND
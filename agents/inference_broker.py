@@ -0,0 +1,181 @@
+"""
+Micro-batching inference broker.
+
+Many callers (seats, tables, concurrent API sessions) submit single state
+vectors; a worker thread gathers them into batches and evaluates each batch
+with one forward call, then routes each row of the result back to its
+caller through a Future.
+
+A batch is dispatched as soon as it holds ``max_batch_size`` requests, or
+one request from every recently active caller thread, or ``max_delay_ms``
+after its first request arrived, whichever comes first. A lone sequential
+caller therefore never waits for company that cannot arrive. With
+``max_delay_ms=0`` the worker never waits: it takes whatever is queued
+(requests pile up on their own while a forward pass is running).
+
+The broker is backend-agnostic: ``forward`` maps an (N, state_dim) float32
+array to an (N, action_dim) array of logits and is only ever called from
+the worker thread.
+
+Usage:
+    broker = InferenceBroker(model_forward(model), max_batch_size=64, max_delay_ms=1.0)
+    logits = broker.infer(state_vec)          # blocks until the batch runs
+    future = broker.submit(state_vec)         # or collect the result later
+    broker.close()
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from typing import Callable
+
+import numpy as np
+
+# Maps an (N, state_dim) float32 batch to (N, action_dim) logits
+ForwardFn = Callable[[np.ndarray], np.ndarray]
+
+# Queue item telling the worker to exit
+_STOP = None
+
+# A caller thread counts as active for this long after its last request
+_ACTIVE_WINDOW = 0.05
+
+
+class _BatchWorker:
+    """The broker's worker loop; holds no reference back to the broker."""
+
+    def __init__(self, forward: ForwardFn, max_batch_size: int, max_delay: float) -> None:
+        self.forward = forward
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.queue: queue.SimpleQueue[tuple[np.ndarray, Future] | None] = queue.SimpleQueue()
+        self.batches = 0
+        self.requests = 0
+        # Caller thread id -> time of its last request
+        self.last_seen: dict[int, float] = {}
+
+    def active_callers(self, now: float) -> int:
+        cutoff = now - _ACTIVE_WINDOW
+        stale = [t for t, seen in list(self.last_seen.items()) if seen < cutoff]
+        for t in stale:
+            self.last_seen.pop(t, None)
+        return len(self.last_seen)
+
+    def run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self.queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            now = time.monotonic()
+            deadline = now + self.max_delay
+            # Wait only while some active caller has no request in the batch;
+            # after that just take what is already queued
+            expected = self.active_callers(now)
+            while len(batch) < self.max_batch_size:
+                try:
+                    wait = deadline - time.monotonic() if len(batch) < expected else 0
+                    item = self.queue.get(timeout=wait) if wait > 0 else self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self.dispatch(batch)
+
+    def dispatch(self, batch: list[tuple[np.ndarray, Future]]) -> None:
+        # Drop requests whose caller cancelled while they were queued
+        batch = [(s, f) for s, f in batch if f.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        states = np.stack([s for s, _ in batch])
+        futures = [f for _, f in batch]
+        try:
+            logits = np.asarray(self.forward(states.astype(np.float32, copy=False)))
+        except BaseException as exc:
+            for f in futures:
+                f.set_exception(exc)
+            return
+        self.batches += 1
+        self.requests += len(futures)
+        for f, row in zip(futures, logits):
+            f.set_result(row)
+
+
+class InferenceBroker:
+    """
+    Queues single-state inference requests and evaluates them in batches.
+
+    The worker thread stops on ``close()`` or once the broker itself is
+    garbage collected, so a broker that is replaced while agents still
+    hold it keeps serving them until the last one drops it.
+    """
+
+    def __init__(
+        self,
+        forward: ForwardFn,
+        max_batch_size: int = 64,
+        max_delay_ms: float = 1.0,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be >= 1, got {max_batch_size}")
+        if max_delay_ms < 0:
+            raise ValueError(f"max_delay_ms must be >= 0, got {max_delay_ms}")
+        self.forward = forward
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000.0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._worker = _BatchWorker(forward, max_batch_size, self.max_delay)
+        self._thread = threading.Thread(
+            target=self._worker.run, name="inference-broker", daemon=True
+        )
+        self._thread.start()
+        self._stop = weakref.finalize(self, self._worker.queue.put, _STOP)
+
+    # Batch-size stats, for tuning the latency budget
+    @property
+    def batches(self) -> int:
+        return self._worker.batches
+
+    @property
+    def requests(self) -> int:
+        return self._worker.requests
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.requests / self.batches if self.batches else 0.0
+
+    def submit(self, state_vec: np.ndarray) -> Future:
+        """Queue one state vector; the Future resolves to its logits row."""
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("InferenceBroker is closed")
+            self._worker.last_seen[threading.get_ident()] = time.monotonic()
+            self._worker.queue.put((state_vec, future))
+        return future
+
+    def infer(self, state_vec: np.ndarray, timeout: float | None = None) -> np.ndarray:
+        """Submit one state vector and wait for its logits."""
+        return self.submit(state_vec).result(timeout)
+
+    def close(self) -> None:
+        """Finish queued requests, then stop the worker thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._stop()
+        self._thread.join()
+
+    def __enter__(self) -> "InferenceBroker":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
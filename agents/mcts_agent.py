@@ -4,13 +4,25 @@ MCTS agent for Blackjack using determinization for partial observability
 """
 from __future__ import annotations
 
-import copy
+import atexit
 import math
 import random
-from dataclasses import dataclass, field
-
-from agents.base_agent import BaseAgent
-from engine.deck import Card, ALL_CARDS, hand_value, is_bust, is_blackjack
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+
+from agents.base_agent import BaseAgent, LazyReason
+from engine.dealer import CARD_VALUES, composition_key, dealer_outcomes, stand_ev
+from engine.deck import (
+    ACE_RANK,
+    ALL_CODES,
+    NUM_RANKS,
+    RANK_OF,
+    VALUE_OF,
+    CardCode,
+    HandState,
+)
 from engine.game import ObservableState
 from engine.rules import (
     ACTION_DOUBLE,
@@ -24,67 +36,311 @@ from engine.rules import (
 
 
 # ---------------------------------------------------------------------------
-# Lightweight game state for MCTS rollouts
+# Mutable search state (apply / undo)
 # ---------------------------------------------------------------------------
 
-@dataclass
-class MCTSGameState:
-    """Minimal game state for tree search rollouts."""
-    player_hand: list[Card]
-    dealer_hand: list[Card]          # full (hole card known in simulation)
-    deck_remaining: list[Card]
-    bet: float
-    game_over: bool = False
-    payout: float = 0.0
-    doubled: bool = False
-
-    def copy(self) -> "MCTSGameState":
-        return MCTSGameState(
-            player_hand=self.player_hand[:],
-            dealer_hand=self.dealer_hand[:],
-            deck_remaining=self.deck_remaining[:],
-            bet=self.bet,
-            game_over=self.game_over,
-            payout=self.payout,
-            doubled=self.doubled,
-        )
+def _draw_rank(counts: list[int], total: int, rng: random.Random) -> int:
+    """Pick a rank index with probability counts[rank] / total, in O(13)."""
+    x = rng.randrange(total)
+    for rank, c in enumerate(counts):
+        x -= c
+        if x < 0:
+            return rank
+    return NUM_RANKS - 1
 
 
-def _deal_from(deck: list[Card], rng: random.Random) -> Card:
-    if not deck:
-        return rng.choice(ALL_CARDS)
-    idx = rng.randrange(len(deck))
-    deck[idx], deck[-1] = deck[-1], deck[idx]
-    return deck.pop()
+def _hole_weights(counts: list[int], upcard: CardCode) -> list[int]:
+    """
+    Hole-card weights per rank. The hole card cannot complete a dealer
+    natural: that would have ended the round before the player acted.
+    """
+    weights = counts[:]
+    up_value = VALUE_OF[upcard]
+    if up_value == 11:
+        for rank in range(NUM_RANKS):
+            if VALUE_OF[rank] == 10:
+                weights[rank] = 0
+    elif up_value == 10:
+        weights[ACE_RANK] = 0
+    return weights
+
+
+class SearchState:
+    """
+    One determinized world, mutated in place during tree search.
+
+    ``apply(action)`` plays an action (drawing cards from the shared per-rank
+    composition) and journals what changed; ``undo()`` reverts the last
+    apply. Passing ``cards`` replays a node's recorded draws instead of
+    sampling new ones. Cards drawn from the composition use their rank index
+    as card code; draws from an exhausted composition use another suit, so
+    undo knows not to return them. ``soft17_hit`` and ``blackjack_pays``
+    are the table rules the world is played and scored under.
+    """
 
+    __slots__ = (
+        "player", "dealer", "counts", "cards_left", "bet", "base_bet",
+        "game_over", "payout", "rng", "soft17_hit", "blackjack_pays",
+        "_journal", "_script",
+    )
 
-def _finalize(state: MCTSGameState, soft17_hit: bool = True) -> float:
-    """Run dealer to completion and return net payout (normalized by bet)."""
-    while dealer_should_hit(state.dealer_hand, soft17_hit):
-        if state.deck_remaining:
-            state.dealer_hand.append(state.deck_remaining.pop())
+    def __init__(
+        self,
+        player: HandState,
+        dealer: HandState,
+        counts: list[int],
+        bet: float,
+        rng: random.Random,
+        soft17_hit: bool = True,
+        blackjack_pays: float = 1.5,
+    ) -> None:
+        self.player = player
+        self.dealer = dealer           # full (hole card known in simulation)
+        self.counts = counts           # undealt cards per rank index
+        self.cards_left = sum(counts)
+        self.bet = bet
+        self.base_bet = max(bet, 1.0)
+        self.game_over = False
+        self.payout = 0.0
+        self.rng = rng
+        self.soft17_hit = soft17_hit
+        self.blackjack_pays = blackjack_pays
+        self._journal: list[tuple[str, tuple[CardCode, ...], CardCode, float]] = []
+        self._script: list[CardCode] = []
+
+    @property
+    def last_drawn(self) -> tuple[CardCode, ...]:
+        return self._journal[-1][1]
+
+    def reward(self) -> float:
+        """Terminal payout in units of the original wager (a lost double is -2)."""
+        return self.payout / self.base_bet
+
+    def _draw(self, drawn: list[CardCode]) -> CardCode:
+        if self._script:
+            code = self._script.pop()
+            if code < NUM_RANKS:
+                self.counts[code] -= 1
+                self.cards_left -= 1
+        elif self.cards_left > 0:
+            code = _draw_rank(self.counts, self.cards_left, self.rng)
+            self.counts[code] -= 1
+            self.cards_left -= 1
         else:
-            break
-    p = compute_payout(state.player_hand, state.dealer_hand, state.bet)
-    return p / max(state.bet, 1.0)
+            code = NUM_RANKS + self.rng.randrange(len(ALL_CODES) - NUM_RANKS)
+        drawn.append(code)
+        return code
+
+    def _return(self, code: CardCode) -> None:
+        if code < NUM_RANKS:
+            self.counts[code] += 1
+            self.cards_left += 1
+
+    def redeal_hole(self, code: CardCode) -> None:
+        """Swap the dealer's hole card for ``code`` (only valid at the root)."""
+        self._return(self.dealer.pop())
+        if code < NUM_RANKS:
+            self.counts[code] -= 1
+            self.cards_left -= 1
+        self.dealer.add(code)
+
+    def _dealer_plays(self, drawn: list[CardCode]) -> None:
+        while dealer_should_hit(self.dealer, self.soft17_hit):
+            self.dealer.add(self._draw(drawn))
+        self.payout = compute_payout(
+            self.player, self.dealer, self.bet, self.blackjack_pays
+        )
+        self.game_over = True
+
+    def apply(
+        self, action: str, cards: tuple[CardCode, ...] | None = None
+    ) -> list[str]:
+        """Play ``action``; return the next legal actions ([] once terminal)."""
+        if cards:
+            self._script = list(reversed(cards))
+        drawn: list[CardCode] = []
+        split_card = -1
+        prev_bet = self.bet
+        legal: list[str] = []
+
+        if action == ACTION_STAND:
+            # Dealer plays out
+            self._dealer_plays(drawn)
+
+        elif action == ACTION_HIT:
+            self.player.add(self._draw(drawn))
+            if self.player.is_bust:
+                self.payout = -self.bet
+                self.game_over = True
+            else:
+                legal = get_legal_actions(
+                    self.player,
+                    bankroll=1e9,
+                    current_bet=self.bet,
+                    can_double=False,
+                    can_split=False,
+                    is_first_action=False,
+                )
+
+        elif action == ACTION_DOUBLE:
+            self.bet *= 2
+            self.player.add(self._draw(drawn))
+            if self.player.is_bust:
+                self.payout = -self.bet
+                self.game_over = True
+            else:
+                # Exactly one card then stand
+                self._dealer_plays(drawn)
+
+        elif action == ACTION_SPLIT:
+            # Simplified split: play first split hand only
+            split_card = self.player.pop()
+            self.player.add(self._draw(drawn))
+            legal = get_legal_actions(
+                self.player,
+                bankroll=1e9,
+                current_bet=self.bet,
+                can_double=False,
+                can_split=False,
+                is_first_action=True,
+            )
+
+        self._script.clear()
+        self._journal.append((action, tuple(drawn), split_card, prev_bet))
+        return legal
+
+    def undo(self) -> None:
+        """Revert the most recent ``apply``."""
+        action, drawn, split_card, prev_bet = self._journal.pop()
+        n_player = 0 if action == ACTION_STAND else 1
+        for code in drawn[n_player:]:
+            self.dealer.pop()
+            self._return(code)
+        if n_player and drawn:
+            self.player.pop()
+            self._return(drawn[0])
+        if split_card >= 0:
+            self.player.add(split_card)
+        self.bet = prev_bet
+        self.game_over = False
+        self.payout = 0.0
+
+    def undo_to(self, depth: int) -> None:
+        while len(self._journal) > depth:
+            self.undo()
+
+
+# ---------------------------------------------------------------------------
+# Expectimax leaf evaluation
+# ---------------------------------------------------------------------------
+
+def _add_card(total: int, soft: int, value: int) -> tuple[int, int]:
+    """Add a card value to (total, soft aces counted as 11)."""
+    total += value
+    soft += value == 11
+    while total > 21 and soft:
+        total -= 10
+        soft -= 1
+    return total, soft
+
+
+@lru_cache(maxsize=4096)
+def _player_values(
+    up_value: int, bucket: tuple[int, ...], soft17_hit: bool = True
+) -> dict[tuple[int, int], float]:
+    """
+    Expected value per unit bet of the best HIT/STAND continuation for every
+    player (total, soft) against the upcard, with the dealer conditioned on
+    no natural and draws treated as independent with the bucket's
+    per-value probabilities.
+    """
+    dealer = dealer_outcomes(up_value, bucket, soft17_hit, no_blackjack=True)
+    n = sum(bucket)
+    probs = [c / n for c in bucket]
+    values: dict[tuple[int, int], float] = {}
+
+    def best(total: int, soft: int) -> float:
+        key = (total, soft)
+        if key not in values:
+            hit = 0.0
+            for value, p in zip(CARD_VALUES, probs):
+                if p:
+                    t, s = _add_card(total, soft, value)
+                    hit += p * (-1.0 if t > 21 else best(t, s))
+            stand = stand_ev(total, dealer)
+            values[key] = max(stand, hit) if total < 21 else stand
+        return values[key]
+
+    for total in range(21, 3, -1):
+        best(total, 0)
+    for total in range(21, 11, -1):
+        best(total, 1)
+    return values
+
+
+def _expectimax_value(world: SearchState) -> float:
+    """
+    Exact value of the player's current hand, in units of the original
+    wager, playing on optimally with HIT/STAND under the world's rules. The
+    dealer side uses only what the player knows: the upcard and the unseen
+    composition with the world's hole card put back.
+    """
+    counts = world.counts[:]
+    hole = world.dealer[1]
+    if hole < NUM_RANKS:
+        counts[hole] += 1
+    up_value = VALUE_OF[world.dealer[0]]
+    bucket = composition_key(counts)
+    player = world.player
+    scale = world.bet / world.base_bet
+    if player.is_blackjack:
+        # Two-card 21 on a split hand still pays as a natural in this engine
+        return world.blackjack_pays * scale
+    values = _player_values(up_value, bucket, world.soft17_hit)
+    value = values[(player.total, int(player.soft))]
+    return value * scale
 
 
 # ---------------------------------------------------------------------------
 # MCTS Node
 # ---------------------------------------------------------------------------
 
-@dataclass
 class MCTSNode:
-    game_state: MCTSGameState
-    action: str | None
-    parent: "MCTSNode | None"
-    children: list["MCTSNode"] = field(default_factory=list)
-    visits: int = 0
-    total_reward: float = 0.0
-    untried_actions: list[str] = field(default_factory=list)
+    """
+    Search tree node. Holds only the delta from its parent: the action and
+    the cards it drew, plus the fixed reward if the action ended the hand.
+
+    In ISMCTS trees an action node has no fixed cards; ``outcomes`` maps the
+    rank of the player card the action drew to the next decision node.
+    """
+
+    __slots__ = (
+        "action", "cards", "parent", "children", "visits", "total_reward",
+        "untried_actions", "terminal", "terminal_reward", "outcomes",
+    )
+
+    def __init__(
+        self,
+        action: str | None,
+        parent: "MCTSNode | None",
+        untried_actions: list[str],
+        cards: tuple[CardCode, ...] = (),
+        terminal: bool = False,
+        terminal_reward: float = 0.0,
+    ) -> None:
+        self.action = action
+        self.cards = cards
+        self.parent = parent
+        self.children: list[MCTSNode] = []
+        self.visits = 0
+        self.total_reward = 0.0
+        self.untried_actions = untried_actions
+        self.terminal = terminal
+        self.terminal_reward = terminal_reward
+        self.outcomes: dict[int, MCTSNode] | None = None
 
     def is_terminal(self) -> bool:
-        return self.game_state.game_over
+        return self.terminal
 
     def is_fully_expanded(self) -> bool:
         return len(self.untried_actions) == 0
@@ -97,13 +353,96 @@ class MCTSNode:
         )
 
     def best_child(self, c: float = 1.41) -> "MCTSNode":
-        return max(self.children, key=lambda n: n.ucb1(self.visits, c))
+        # Same choice as max(children, key=ucb1), with log(N) hoisted
+        log_n = math.log(self.visits)
+        best = self.children[0]
+        best_score = -math.inf
+        for child in self.children:
+            if child.visits == 0:
+                return child
+            score = child.total_reward / child.visits + c * math.sqrt(log_n / child.visits)
+            if score > best_score:
+                best, best_score = child, score
+        return best
 
 
 # ---------------------------------------------------------------------------
 # MCTS Agent
 # ---------------------------------------------------------------------------
 
+def _visits_reason(best: str, action_visits: dict[str, int]) -> str:
+    total = sum(action_visits.values()) or 1
+    best_pct = int(100 * action_visits[best] / total)
+    return f"MCTS: '{best}' chosen in {total} simulations ({best_pct}% visits)"
+
+
+SEARCH_DETERMINIZED = "determinized"  # one tree per sampled hole card, root visits summed
+SEARCH_ISMCTS = "ismcts"              # one information-set tree, new world every iteration
+
+SEARCH_MODES = (SEARCH_DETERMINIZED, SEARCH_ISMCTS)
+
+LEAF_EXPECTIMAX = "expectimax"  # exact HIT/STAND value of the leaf hand
+LEAF_ROLLOUT = "rollout"        # one uniform random HIT/STAND playout
+
+LEAF_EVALUATORS = (LEAF_EXPECTIMAX, LEAF_ROLLOUT)
+
+
+@dataclass(frozen=True)
+class SearchInput:
+    """Everything a root search needs; small enough to ship to a worker."""
+    player_hand: tuple[CardCode, ...]
+    dealer_upcard: CardCode
+    counts: tuple[int, ...]              # unseen cards per rank (incl. hole card)
+    bet: float
+
+
+# Persistent worker pools for root-parallel search, one per worker count
+_pools: dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(n_workers: int) -> ProcessPoolExecutor:
+    with _pools_lock:
+        pool = _pools.get(n_workers)
+        if pool is None:
+            pool = _pools[n_workers] = ProcessPoolExecutor(max_workers=n_workers)
+        return pool
+
+
+@atexit.register
+def _shutdown_pools() -> None:
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(cancel_futures=True)
+        _pools.clear()
+
+
+def _search_worker(
+    inp: SearchInput,
+    legal_actions: list[str],
+    search: str,
+    leaf_eval: str,
+    ucb_c: float,
+    n_simulations: int,
+    n_determinizations: int,
+    seed: int,
+    soft17_hit: bool,
+    blackjack_pays: float,
+) -> dict[str, int]:
+    """Run one root-parallel sub-search in a worker; return root visit counts."""
+    agent = MCTSAgent(
+        n_simulations=n_simulations,
+        n_determinizations=n_determinizations,
+        ucb_c=ucb_c,
+        seed=seed,
+        search=search,
+        leaf_eval=leaf_eval,
+        soft17_hit=soft17_hit,
+        blackjack_pays=blackjack_pays,
+    )
+    return agent._root_visits(inp, legal_actions)
+
+
 class MCTSAgent(BaseAgent):
     """
     Monte Carlo Tree Search agent for Blackjack.
@@ -112,6 +451,29 @@ class MCTSAgent(BaseAgent):
     1. Sample N plausible hole cards consistent with visible information.
     2. Run MCTS on each determinized world.
     3. Aggregate visit counts, pick action with most visits.
+
+    With ``search="ismcts"`` a single tree over information sets is shared
+    by all iterations instead: each iteration samples a fresh hole card and
+    shoe order, and decision nodes are keyed on what the player can see
+    (the action path and the ranks of the cards it drew). Statistics below
+    the root are kept, so it needs far fewer simulations per decision.
+    ``n_determinizations`` is ignored in that mode.
+
+    New leaves are scored with ``leaf_eval``: by default the exact
+    expected value of the hand played on with HIT/STAND against the upcard
+    (memoized per composition bucket), so the search converges in tens of
+    simulations; ``"rollout"`` restores the uniform random playout.
+    Simulated dealers and leaf values follow ``soft17_hit`` and
+    ``blackjack_pays``, which should match the game's rules.
+
+    With ``n_workers > 1`` the search is root-parallel: determinizations
+    (or ISMCTS iterations) are split across a persistent process pool, each
+    worker grows its own trees, and the root visit counts are summed. Each
+    decision pays a few hundred microseconds of IPC, so this only helps with
+    large ``n_simulations``. With ``use_pool=False`` the same sub-searches,
+    with the same seeds, run one after another in this process, so the
+    chosen actions do not depend on where the search runs. ParallelTournament
+    sets it in every shard, since nested process pools deadlock.
     """
 
     def __init__(
@@ -121,14 +483,36 @@ class MCTSAgent(BaseAgent):
         n_determinizations: int = 10,
         ucb_c: float = 1.41,
         seed: int | None = None,
+        search: str = SEARCH_DETERMINIZED,
+        n_workers: int = 1,
+        leaf_eval: str = LEAF_EXPECTIMAX,
+        use_pool: bool = True,
+        soft17_hit: bool = True,
+        blackjack_pays: float = 1.5,
     ) -> None:
+        if search not in SEARCH_MODES:
+            raise ValueError(f"search must be one of {SEARCH_MODES}, got '{search}'")
+        if leaf_eval not in LEAF_EVALUATORS:
+            raise ValueError(
+                f"leaf_eval must be one of {LEAF_EVALUATORS}, got '{leaf_eval}'"
+            )
+        if n_workers < 1:
+            raise ValueError(f"n_workers must be >= 1, got {n_workers}")
         super().__init__(player_id)
         self.n_simulations = n_simulations
         self.n_determinizations = n_determinizations
         self.ucb_c = ucb_c
+        self.search = search
+        self.n_workers = n_workers
+        self.leaf_eval = leaf_eval
+        self.use_pool = use_pool
+        self.soft17_hit = soft17_hit
+        self.blackjack_pays = blackjack_pays
         self.rng = random.Random(seed)
 
     def name(self) -> str:
+        if self.search == SEARCH_ISMCTS:
+            return f"ISMCTS(sims={self.n_simulations})"
         return f"MCTS(sims={self.n_simulations})"
 
     def choose_action(
@@ -137,181 +521,239 @@ class MCTSAgent(BaseAgent):
         legal_actions: list[str],
     ) -> str:
         if len(legal_actions) == 1:
-            self.last_reason = f"only one legal action: {legal_actions[0]}"
+            self.last_reason = LazyReason("only one legal action: {}", legal_actions[0])
             return legal_actions[0]
 
+        inp = SearchInput(
+            player_hand=state.player_hand,
+            dealer_upcard=state.dealer_upcard,
+            counts=tuple(state.unseen_counts()),
+            bet=state.current_bet,
+        )
+        if self.n_workers > 1:
+            action_visits = self._parallel_root_visits(inp, legal_actions)
+        else:
+            action_visits = self._root_visits(inp, legal_actions)
+
+        best = max(action_visits, key=lambda a: action_visits[a])
+        self.last_reason = LazyReason(_visits_reason, best, action_visits)
+        return best
+
+    def _root_visits(
+        self, inp: SearchInput, legal_actions: list[str]
+    ) -> dict[str, int]:
         action_visits: dict[str, int] = {a: 0 for a in legal_actions}
-        sims_per_world = max(1, self.n_simulations // self.n_determinizations)
 
-        for _ in range(self.n_determinizations):
-            world = self._sample_world(state)
+        if self.search == SEARCH_ISMCTS:
             root = MCTSNode(
-                game_state=world,
                 action=None,
                 parent=None,
                 untried_actions=list(legal_actions),
             )
-            self._run_mcts(root, sims_per_world)
+            self._run_ismcts(root, inp, self.n_simulations)
             for child in root.children:
-                if child.action in action_visits:
-                    action_visits[child.action] += child.visits
+                action_visits[child.action] += child.visits
+        else:
+            sims_per_world = max(1, self.n_simulations // self.n_determinizations)
+            for _ in range(self.n_determinizations):
+                world = self._sample_world(inp)
+                root = MCTSNode(
+                    action=None,
+                    parent=None,
+                    untried_actions=list(legal_actions),
+                )
+                self._run_mcts(root, world, sims_per_world)
+                for child in root.children:
+                    if child.action in action_visits:
+                        action_visits[child.action] += child.visits
+
+        return action_visits
+
+    def _parallel_root_visits(
+        self, inp: SearchInput, legal_actions: list[str]
+    ) -> dict[str, int]:
+        # Split the budget as evenly as possible; ISMCTS splits iterations,
+        # determinized search splits whole worlds
+        if self.search == SEARCH_ISMCTS:
+            units = self.n_simulations
+        else:
+            units = self.n_determinizations
+        n_jobs = min(self.n_workers, units)
+        sims_per_world = max(1, self.n_simulations // self.n_determinizations)
 
-        best = max(action_visits, key=lambda a: action_visits[a])
-        total = sum(action_visits.values()) or 1
-        best_pct = int(100 * action_visits[best] / total)
-        self.last_reason = (
-            f"MCTS: '{best}' chosen in {total} simulations ({best_pct}% visits)"
-        )
-        return best
+        jobs = []
+        for k in range(n_jobs):
+            share = units // n_jobs + (k < units % n_jobs)
+            if self.search == SEARCH_ISMCTS:
+                n_sims, n_dets = share, 1
+            else:
+                n_sims, n_dets = share * sims_per_world, share
+            jobs.append((
+                inp, legal_actions, self.search, self.leaf_eval, self.ucb_c,
+                n_sims, n_dets, self.rng.getrandbits(64),
+                self.soft17_hit, self.blackjack_pays,
+            ))
+
+        if self.use_pool:
+            pool = _get_pool(self.n_workers)
+            futures = [pool.submit(_search_worker, *job) for job in jobs]
+            results = [fut.result() for fut in futures]
+        else:
+            results = [_search_worker(*job) for job in jobs]
 
-    def _sample_world(self, state: ObservableState) -> MCTSGameState:
-        """Build a determinized world by sampling a plausible hole card."""
-        # Build pool of unknown cards
-        known: set[Card] = set(state.player_hand) | {state.dealer_upcard}
-        for c in state.seen_cards:
-            known.add(c)
-
-        unknown: list[Card] = [c for c in ALL_CARDS if c not in known]
-        # Weight: multiple copies possible in shoe (not tracked precisely, sample uniformly)
-        self.rng.shuffle(unknown)
-
-        # Dealer hole card: pick from unknown pool
-        hole_card = unknown[0] if unknown else self.rng.choice(ALL_CARDS)
-        deck_remaining = unknown[1:] if len(unknown) > 1 else []
-
-        return MCTSGameState(
-            player_hand=list(state.player_hand),
-            dealer_hand=[state.dealer_upcard, hole_card],
-            deck_remaining=deck_remaining,
-            bet=state.current_bet,
+        action_visits: dict[str, int] = {a: 0 for a in legal_actions}
+        for visits_by_action in results:
+            for action, visits in visits_by_action.items():
+                action_visits[action] += visits
+        return action_visits
+
+    def _sample_world(self, inp: SearchInput) -> SearchState:
+        """
+        Build a determinized world by sampling a plausible hole card.
+
+        The hole card and every later draw come from the per-rank counts of
+        the unseen cards in the real shoe, so probabilities match the actual
+        multi-deck composition. The hole card cannot complete a dealer
+        natural: that would have ended the round before the player acted.
+        """
+        counts = list(inp.counts)
+        weights = _hole_weights(counts, inp.dealer_upcard)
+        hole_card = self._draw_hole(weights, sum(weights))
+        if hole_card < NUM_RANKS:
+            counts[hole_card] -= 1
+
+        return SearchState(
+            player=HandState(inp.player_hand),
+            dealer=HandState((inp.dealer_upcard, hole_card)),
+            counts=counts,
+            bet=inp.bet,
+            rng=self.rng,
+            soft17_hit=self.soft17_hit,
+            blackjack_pays=self.blackjack_pays,
         )
 
-    def _run_mcts(self, root: MCTSNode, n_iterations: int) -> None:
+    def _draw_hole(self, weights: list[int], total: int) -> CardCode:
+        if total > 0:
+            return _draw_rank(weights, total, self.rng)
+        # Nothing plausible left: any card outside the tracked composition
+        return NUM_RANKS + self.rng.randrange(len(ALL_CODES) - NUM_RANKS)
+
+    def _run_mcts(self, root: MCTSNode, world: SearchState, n_iterations: int) -> None:
         for _ in range(n_iterations):
-            node = self._select(root)
+            node = self._select(root, world)
             if not node.is_terminal() and not node.is_fully_expanded():
-                node = self._expand(node)
-            reward = self._simulate(node)
+                node = self._expand(node, world)
+            reward = self._simulate(node, world)
             self._backpropagate(node, reward)
+            world.undo_to(0)
 
-    def _select(self, node: MCTSNode) -> MCTSNode:
+    def _run_ismcts(
+        self, root: MCTSNode, inp: SearchInput, n_iterations: int
+    ) -> None:
+        world = self._sample_world(inp)
+        weights = _hole_weights(list(inp.counts), inp.dealer_upcard)
+        total = sum(weights)
+        for i in range(n_iterations):
+            if i:
+                # New determinization: fresh hole card; later draws are random
+                world.undo_to(0)
+                world.redeal_hole(self._draw_hole(weights, total))
+            node = root
+            while True:
+                # node is a decision node: pick an action edge
+                if node.untried_actions:
+                    action = self.rng.choice(node.untried_actions)
+                    node.untried_actions.remove(action)
+                    edge = MCTSNode(action=action, parent=node, untried_actions=[])
+                    node.children.append(edge)
+                    expanded = True
+                else:
+                    edge = node.best_child(self.ucb_c)
+                    expanded = False
+
+                legal = world.apply(edge.action)
+                if world.game_over:
+                    node = edge
+                    reward = world.reward()
+                    break
+
+                # Branch on the card the player saw; dealer cards stay hidden
+                if edge.outcomes is None:
+                    edge.outcomes = {}
+                key = RANK_OF[world.last_drawn[0]]
+                child = edge.outcomes.get(key)
+                if child is None:
+                    child = MCTSNode(action=None, parent=edge, untried_actions=legal)
+                    edge.outcomes[key] = child
+                    expanded = True
+                node = child
+                if expanded:
+                    reward = self._evaluate(world, legal)
+                    break
+
+            self._backpropagate(node, reward)
+
+    def _select(self, node: MCTSNode, world: SearchState) -> MCTSNode:
         while (
             not node.is_terminal()
             and node.is_fully_expanded()
             and node.children
         ):
             node = node.best_child(self.ucb_c)
+            if not node.is_terminal():
+                # Terminal rewards are stored; only replay interior deltas
+                world.apply(node.action, node.cards)
         return node
 
-    def _expand(self, node: MCTSNode) -> MCTSNode:
+    def _expand(self, node: MCTSNode, world: SearchState) -> MCTSNode:
         if not node.untried_actions:
             return node
 
         action = self.rng.choice(node.untried_actions)
         node.untried_actions.remove(action)
 
-        new_state = node.game_state.copy()
-        new_state, next_legal = self._apply_action(new_state, action)
-
+        next_legal = world.apply(action)
         child = MCTSNode(
-            game_state=new_state,
             action=action,
             parent=node,
             untried_actions=next_legal,
+            cards=world.last_drawn,
+            terminal=world.game_over,
+            terminal_reward=world.reward() if world.game_over else 0.0,
         )
         node.children.append(child)
         return child
 
-    def _apply_action(
-        self, state: MCTSGameState, action: str
-    ) -> tuple[MCTSGameState, list[str]]:
-        """Apply action to state; return updated state and next legal actions."""
-        if action == ACTION_STAND:
-            # Dealer plays out
-            while dealer_should_hit(state.dealer_hand):
-                card = _deal_from(state.deck_remaining, self.rng)
-                state.dealer_hand.append(card)
-            state.payout = compute_payout(
-                state.player_hand, state.dealer_hand, state.bet
-            )
-            state.game_over = True
-            return state, []
-
-        elif action == ACTION_HIT:
-            card = _deal_from(state.deck_remaining, self.rng)
-            state.player_hand.append(card)
-            if is_bust(state.player_hand):
-                state.payout = -state.bet
-                state.game_over = True
-                return state, []
-            legal = get_legal_actions(
-                state.player_hand,
-                bankroll=1e9,
-                current_bet=state.bet,
-                can_double=False,
-                can_split=False,
-                is_first_action=False,
-            )
-            return state, legal
-
-        elif action == ACTION_DOUBLE:
-            state.doubled = True
-            state.bet *= 2
-            card = _deal_from(state.deck_remaining, self.rng)
-            state.player_hand.append(card)
-            if is_bust(state.player_hand):
-                state.payout = -state.bet
-                state.game_over = True
-                return state, []
-            # Exactly one card then stand
-            while dealer_should_hit(state.dealer_hand):
-                state.dealer_hand.append(_deal_from(state.deck_remaining, self.rng))
-            state.payout = compute_payout(
-                state.player_hand, state.dealer_hand, state.bet
-            )
-            state.game_over = True
-            return state, []
-
-        elif action == ACTION_SPLIT:
-            # Simplified split: play first split hand only
-            card1 = state.player_hand[0]
-            state.player_hand = [card1, _deal_from(state.deck_remaining, self.rng)]
-            legal = get_legal_actions(
-                state.player_hand,
-                bankroll=1e9,
-                current_bet=state.bet,
-                can_double=False,
-                can_split=False,
-                is_first_action=True,
-            )
-            return state, legal
-
-        return state, []
-
-    def _simulate(self, node: MCTSNode) -> float:
-        """Random rollout to terminal; return normalized payout in [-1, 1]."""
+    def _simulate(self, node: MCTSNode, world: SearchState) -> float:
+        """Value of a leaf as normalized payout in [-2, 2]."""
         if node.is_terminal():
-            return node.game_state.payout / max(node.game_state.bet, 1.0)
+            return node.terminal_reward
 
-        state = node.game_state.copy()
         legal = list(node.untried_actions) + [
             c.action for c in node.children if c.action is not None
         ]
         if not legal:
             legal = [ACTION_STAND]
+        return self._evaluate(world, legal)
+
+    def _evaluate(self, world: SearchState, legal: list[str]) -> float:
+        if self.leaf_eval == LEAF_EXPECTIMAX:
+            return _expectimax_value(world)
+        return self._rollout(world, legal)
 
-        while not state.game_over:
+    def _rollout(self, world: SearchState, legal: list[str]) -> float:
+        while not world.game_over:
             # Exclude SPLIT/DOUBLE from rollout for simplicity
             simple = [a for a in legal if a in (ACTION_HIT, ACTION_STAND)]
             if not simple:
                 simple = [ACTION_STAND]
             action = self.rng.choice(simple)
-            state, legal = self._apply_action(state, action)
-            if not legal and not state.game_over:
+            legal = world.apply(action)
+            if not legal and not world.game_over:
                 # Force stand
-                state, legal = self._apply_action(state, ACTION_STAND)
+                legal = world.apply(ACTION_STAND)
 
-        return state.payout / max(state.bet, 1.0)
+        return world.reward()
 
     def _backpropagate(self, node: MCTSNode, reward: float) -> None:
         current = node
@@ -0,0 +1,80 @@
+"""
+Process-wide cache of loaded model checkpoints.
+
+Each checkpoint is loaded once per process and the loaded object is shared
+by every agent that asks for it, so it must be treated as read-only.
+Entries are keyed on (resolved path, file mtime, kind): rewriting a
+checkpoint on disk makes the next lookup load the new file, and the stale
+entry is dropped. ``kind`` separates different loaded forms of the same
+file (e.g. a torch model per device). The least recently used entry is
+evicted once more than ``max_models`` are held. Caches derived from a
+model (brokers, compiled backends) register an ``on_evict`` hook to drop
+their entries with it, so an evicted model can actually be freed.
+
+Usage:
+    model = registry.get("models/blackjack_mlp.pt", "torch:cpu", load_fn)
+"""
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable
+
+
+class ModelRegistry:
+    """LRU cache of loaded models keyed on path + mtime + kind."""
+
+    def __init__(self, max_models: int = 4) -> None:
+        if max_models < 1:
+            raise ValueError(f"max_models must be >= 1, got {max_models}")
+        self.max_models = max_models
+        self._models: OrderedDict[tuple[str, int, str], Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self._evict_hooks: list[Callable[[Any], None]] = []
+
+    def on_evict(self, hook: Callable[[Any], None]) -> Callable[[Any], None]:
+        """Call ``hook(model)`` whenever a model leaves the cache; usable as a decorator."""
+        self._evict_hooks.append(hook)
+        return hook
+
+    def _evicted(self, models: list[Any]) -> None:
+        # Hooks run outside the lock, so they may use the registry themselves
+        for model in models:
+            for hook in self._evict_hooks:
+                hook(model)
+
+    def get(self, path: str | Path, kind: str, load: Callable[[Path], Any]) -> Any:
+        """Return the cached model for ``path``/``kind``, loading it with ``load`` on a miss."""
+        resolved = Path(path).resolve()
+        key = (str(resolved), os.stat(resolved).st_mtime_ns, kind)
+        evicted = []
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._models.move_to_end(key)
+                return model
+            # Loading under the lock keeps concurrent requests from
+            # deserializing the same checkpoint twice
+            model = load(resolved)
+            for old in [k for k in self._models if k[0] == key[0] and k[2] == kind]:
+                evicted.append(self._models.pop(old))   # older version of this file
+            self._models[key] = model
+            while len(self._models) > self.max_models:
+                evicted.append(self._models.popitem(last=False)[1])
+        self._evicted(evicted)
+        return model
+
+    def clear(self) -> None:
+        with self._lock:
+            evicted = list(self._models.values())
+            self._models.clear()
+        self._evicted(evicted)
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+
+# The registry shared by all agents in this process
+registry = ModelRegistry()
@@ -0,0 +1,66 @@
+"""
+Torch-free inference for an exported BlackjackMLP.
+
+``dnn_agent.export_npz`` folds each eval-mode BatchNorm1d into the Linear
+layer before it and saves the resulting dense layers to an ``.npz``; this
+module runs the forward pass with NumPy alone (Linear -> ReLU, with no
+activation after the last layer; Dropout is the identity at inference).
+Importing it does not import torch, so serverless deployments can serve
+the DNN agent without shipping torch.
+
+File layout: ``W0, b0, W1, b1, ...`` with ``Wi`` stored (in_dim, out_dim).
+"""
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+
+class NumpyMLP:
+    """Dense ReLU network; a drop-in batch forward function for DNNAgent."""
+
+    __slots__ = ("layers", "__weakref__")
+
+    def __init__(self, layers: list[tuple[np.ndarray, np.ndarray]]) -> None:
+        if not layers:
+            raise ValueError("NumpyMLP needs at least one layer")
+        self.layers = [
+            (np.ascontiguousarray(w, dtype=np.float32), np.ascontiguousarray(b, dtype=np.float32))
+            for w, b in layers
+        ]
+
+    @property
+    def state_dim(self) -> int:
+        return self.layers[0][0].shape[0]
+
+    @property
+    def action_dim(self) -> int:
+        return self.layers[-1][0].shape[1]
+
+    def forward(self, x: np.ndarray) -> np.ndarray:
+        """Logits for an (N, state_dim) batch or a single state vector."""
+        h = x
+        for w, b in self.layers[:-1]:
+            h = h @ w
+            h += b
+            np.maximum(h, 0.0, out=h)
+        w, b = self.layers[-1]
+        h = h @ w
+        h += b
+        return h
+
+    __call__ = forward
+
+    def save(self, path: str | Path) -> None:
+        arrays = {}
+        for i, (w, b) in enumerate(self.layers):
+            arrays[f"W{i}"] = w
+            arrays[f"b{i}"] = b
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "NumpyMLP":
+        with np.load(path) as data:
+            n = sum(1 for k in data.files if k.startswith("W"))
+            return cls([(data[f"W{i}"], data[f"b{i}"]) for i in range(n)])
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import random
 
-from agents.base_agent import BaseAgent
+from agents.base_agent import BaseAgent, LazyReason
 from engine.game import ObservableState
 
 
@@ -23,5 +23,5 @@ class RandomAgent(BaseAgent):
         legal_actions: list[str],
     ) -> str:
         action = self.rng.choice(legal_actions)
-        self.last_reason = f"random pick from {legal_actions}"
+        self.last_reason = LazyReason("random pick from {}", legal_actions)
         return action
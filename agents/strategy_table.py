@@ -0,0 +1,246 @@
+"""
+Basic strategy tables for arbitrary rule sets.
+
+``generate_strategy`` derives the optimal total-dependent hard / soft / pair
+strategy for a rule set by combinatorial analysis: for every two-card hand
+and dealer upcard it computes action EVs on a full shoe with
+ExpectimaxAgent, averages them over all hands with the same total (weighted
+by how likely each hand is), and keeps the best action.
+
+Generation takes a few seconds per rule set, so tables for the common rule
+sets (``SHIPPED_RULES``, including the default RuleSet) ship precomputed in
+agents/strategy_tables/ and load in O(1). Any other rule set is generated on
+first use and cached as JSON in the user's cache directory:
+$BLACKJACK_CACHE_DIR if set, else $XDG_CACHE_HOME/blackjack/strategy_tables,
+else ~/.cache/blackjack/strategy_tables; never in the source tree. Tables
+are also kept in memory per process. After changing the generator or the
+engine rules, regenerate the shipped tables with ``write_tables(SHIPPED_DIR)``.
+
+Generated tables follow this engine's rules (no double after split), so
+the default RuleSet does not reproduce the built-in chart in
+heuristic_agent exactly. The built-in chart splits as if doubling after a
+split were allowed and hits soft 18 when it cannot double. The generated
+6-deck H17 table differs in 13 cells, each by ExpectimaxAgent's EV:
+- no split: 2s and 3s vs 2-3, 4s vs 5-6, 6s vs 2 (hit instead)
+- double soft 18 vs 2 and soft 19 vs 6 (instead of stand)
+- stand on soft 18 vs 3-6 when doubling is not allowed (instead of hit)
+
+Usage:
+    table = load_strategy(RuleSet(num_decks=2, soft17_hit=False))
+    action, reason = table.decide(hand, dealer_up, can_double, can_split)
+"""
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from agents.expectimax_agent import ExpectimaxAgent
+from engine.deck import ACE_RANK, VALUE_OF, CardView, HandState
+from engine.game import ObservableState
+from engine.rules import (
+    ACTION_DOUBLE,
+    ACTION_HIT,
+    ACTION_SPLIT,
+    ACTION_STAND,
+)
+
+
+def _user_cache_dir() -> Path:
+    override = os.environ.get("BLACKJACK_CACHE_DIR")
+    if override:
+        return Path(override)
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "blackjack" / "strategy_tables"
+
+
+# Default on-disk cache
+DEFAULT_CACHE_DIR = _user_cache_dir()
+
+# Precomputed tables shipped with the package
+SHIPPED_DIR = Path(__file__).resolve().parent / "strategy_tables"
+
+# Table rows are indexed by player total (0..21), columns by upcard value - 2
+_UPCARDS = tuple(range(2, 12))
+
+# One representative rank per card value (2..11)
+_RANK_OF_VALUE = {v: ACE_RANK if v == 11 else VALUE_OF.index(v) for v in _UPCARDS}
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    """The table-relevant game parameters (matches BlackjackGame's)."""
+    num_decks: int = 6
+    soft17_hit: bool = True
+    blackjack_pays: float = 1.5
+
+    @property
+    def key(self) -> str:
+        h17 = "h17" if self.soft17_hit else "s17"
+        return f"{self.num_decks}d-{h17}-bj{self.blackjack_pays:g}"
+
+
+# Rule sets whose tables ship in SHIPPED_DIR
+SHIPPED_RULES = tuple(
+    RuleSet(num_decks=d, soft17_hit=h17, blackjack_pays=bj)
+    for d in (1, 2, 4, 6, 8)
+    for h17 in (True, False)
+    for bj in (1.5, 1.2)
+)
+
+
+@dataclass
+class StrategyTable:
+    """
+    Compiled strategy for one rule set.
+
+    hard[total][up - 2] / soft[total][up - 2]: (action if doubling is
+    allowed, action otherwise). split[pair value][up - 2]: split or not.
+    """
+    rules: RuleSet
+    hard: list[list[tuple[str, str]]]
+    soft: list[list[tuple[str, str]]]
+    split: list[list[bool]]
+
+    def decide(
+        self,
+        hand: HandState,
+        dealer_up: int,
+        can_double: bool,
+        can_split: bool,
+    ) -> tuple[str, str]:
+        """Return (action, reason) for a hand against an upcard value."""
+        col = dealer_up - 2
+        if can_split and hand.pair:
+            value = VALUE_OF[hand[0]]
+            if self.split[value][col]:
+                return ACTION_SPLIT, f"pair of {value}s vs {dealer_up}: split ({self.rules.key})"
+        kind = "soft" if hand.soft else "hard"
+        rows = self.soft if hand.soft else self.hard
+        with_double, without = rows[hand.total][col]
+        action = with_double if can_double else without
+        return action, f"{kind} {hand.total} vs {dealer_up}: {action} ({self.rules.key})"
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "rules": asdict(self.rules),
+            "hard": self.hard,
+            "soft": self.soft,
+            "split": self.split,
+        })
+
+    @classmethod
+    def from_json(cls, text: str) -> "StrategyTable":
+        data = json.loads(text)
+        return cls(
+            rules=RuleSet(**data["rules"]),
+            hard=[[tuple(cell) for cell in row] for row in data["hard"]],
+            soft=[[tuple(cell) for cell in row] for row in data["soft"]],
+            split=data["split"],
+        )
+
+
+def _best(evs: dict[str, float], actions: tuple[str, ...]) -> str:
+    return max(actions, key=lambda a: evs[a])
+
+
+def generate_strategy(rules: RuleSet) -> StrategyTable:
+    """Compute the optimal total-dependent strategy for ``rules``."""
+    agent = ExpectimaxAgent(soft17_hit=rules.soft17_hit, blackjack_pays=rules.blackjack_pays)
+    shoe_size = 52 * rules.num_decks
+    per_value = {v: 4 * rules.num_decks * (4 if v == 10 else 1) for v in _UPCARDS}
+    legal = [ACTION_HIT, ACTION_STAND, ACTION_DOUBLE]
+
+    # Weighted EV sums per (kind, total, upcard) over every two-card hand
+    sums: dict[tuple[str, int, int], dict[str, float]] = {}
+    split = [[False] * len(_UPCARDS) for _ in range(22)]
+
+    for up in _UPCARDS:
+        for v1 in _UPCARDS:
+            for v2 in _UPCARDS:
+                if v2 < v1:
+                    continue
+                cards = (_RANK_OF_VALUE[v1], _RANK_OF_VALUE[v2], _RANK_OF_VALUE[up])
+                hand = HandState(cards[:2])
+                if hand.is_blackjack:
+                    continue
+                # Probability weight of this (unordered) hand given the upcard
+                left = dict(per_value)
+                left[up] -= 1
+                w = left[v1]
+                left[v1] -= 1
+                w *= left[v2] * (1 if v1 == v2 else 2)
+
+                state = ObservableState(
+                    player_hand=cards[:2],
+                    dealer_upcard=cards[2],
+                    deck_cards_remaining=shoe_size - 4,  # minus the hole card
+                    bankroll=float("inf"),
+                    current_bet=1.0,
+                    is_first_action=True,
+                    seen_cards=CardView(list(cards)),
+                    round_num=0,
+                )
+                pair = v1 == v2
+                evs = agent.action_values(state, legal + [ACTION_SPLIT] if pair else legal)
+                if pair:
+                    split[v1][up - 2] = evs[ACTION_SPLIT] > max(evs[a] for a in legal)
+
+                key = ("soft" if hand.soft else "hard", hand.total, up)
+                acc = sums.setdefault(key, dict.fromkeys(legal, 0.0))
+                for a in legal:
+                    acc[a] += w * evs[a]
+
+    hard = [[(ACTION_HIT, ACTION_HIT)] * len(_UPCARDS) for _ in range(22)]
+    soft = [[(ACTION_HIT, ACTION_HIT)] * len(_UPCARDS) for _ in range(22)]
+    for (kind, total, up), acc in sums.items():
+        rows = soft if kind == "soft" else hard
+        rows[total][up - 2] = (
+            _best(acc, (ACTION_HIT, ACTION_STAND, ACTION_DOUBLE)),
+            _best(acc, (ACTION_HIT, ACTION_STAND)),
+        )
+    # 21 is only reachable with three or more cards (or on a split hand)
+    for rows in (hard, soft):
+        rows[21] = [(ACTION_STAND, ACTION_STAND)] * len(_UPCARDS)
+    return StrategyTable(rules=rules, hard=hard, soft=soft, split=split)
+
+
+_loaded: dict[tuple[RuleSet, Path], StrategyTable] = {}
+
+
+def load_strategy(rules: RuleSet, cache_dir: Path | str | None = None) -> StrategyTable:
+    """
+    Return the strategy table for ``rules``: from memory, else the shipped
+    table, else the disk cache, else freshly generated (and written to the
+    cache if possible).
+    """
+    cache = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+    table = _loaded.get((rules, cache))
+    if table is not None:
+        return table
+
+    shipped = SHIPPED_DIR / f"{rules.key}.json"
+    path = cache / f"{rules.key}.json"
+    if shipped.exists():
+        table = StrategyTable.from_json(shipped.read_text())
+    elif path.exists():
+        table = StrategyTable.from_json(path.read_text())
+    else:
+        table = generate_strategy(rules)
+        try:
+            cache.mkdir(parents=True, exist_ok=True)
+            path.write_text(table.to_json())
+        except OSError:
+            pass  # read-only deployment: keep the in-memory copy only
+    _loaded[(rules, cache)] = table
+    return table
+
+
+def write_tables(directory: Path | str, rule_sets: Sequence[RuleSet] = SHIPPED_RULES) -> None:
+    """Generate the tables for ``rule_sets`` into ``directory``."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for rules in rule_sets:
+        (directory / f"{rules.key}.json").write_text(generate_strategy(rules).to_json())
@@ -8,21 +8,28 @@ Endpoints:
     GET  /health      — liveness check
     GET  /agents      — list of available agent names
     POST /run         — run a tournament session, returns full JSON result
+    POST /run/stream  — same session streamed round by round (NDJSON, or SSE
+                        when the client accepts text/event-stream)
 """
 from __future__ import annotations
 
+import json
+import os
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Iterator, List, Optional
 
 # Allow imports from project root
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
-from engine.deck import Card
+from agents.strategy_table import RuleSet
+from engine.deck import card_from_code
 from engine.multi_game import (
     AgentLeaderboardEntry,
     AgentRoundResult,
@@ -32,7 +39,14 @@ from engine.multi_game import (
     MultiSessionResult,
 )
 
-app = FastAPI(title="Blackjack AI Tournament API", version="1.0.0")
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    _configure_models()
+    yield
+
+
+app = FastAPI(title="Blackjack AI Tournament API", version="1.0.0", lifespan=_lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -51,10 +65,28 @@ AVAILABLE_AGENTS = [
     "Heuristic(basic)",
     "Heuristic(aggressive)",
     "MCTS",
+    "Expectimax",
     "DNN",
 ]
 
 
+# DNN micro-batching, opt-in for hosts serving many concurrent sessions: max
+# decisions per forward pass (1, the default, disables the broker) and how
+# long the first decision in a batch may wait for other active sessions
+DNN_MAX_BATCH = int(os.environ.get("DNN_MAX_BATCH", "1"))
+DNN_MAX_DELAY_MS = float(os.environ.get("DNN_MAX_DELAY_MS", "1.0"))
+# Loaded checkpoints kept per process, and comma-separated checkpoint paths
+# to load at startup so the first DNN request does not pay for it
+DNN_MAX_MODELS = int(os.environ.get("DNN_MAX_MODELS", "4"))
+DNN_PRELOAD = [p for p in os.environ.get("DNN_PRELOAD", "").split(",") if p.strip()]
+# DNN inference backend: eager, torchscript, onnx, int8, numpy or auto
+# (unset: the model as loaded)
+DNN_BACKEND = os.environ.get("DNN_BACKEND") or None
+
+# Table rules every session plays; rule-aware agents are built for them
+RULES = RuleSet()
+
+
 class RunRequest(BaseModel):
     agents: List[str] = Field(default=["Random", "Heuristic(basic)"])
     num_rounds: int = Field(default=20, ge=1, le=500)
@@ -78,36 +110,57 @@ def _build_agents(req: RunRequest) -> list:
             agents.append(RandomAgent())
         elif n in ("heuristic(basic)", "heuristic basic", "heuristic - basic"):
             from agents.heuristic_agent import HeuristicAgent
-            agents.append(HeuristicAgent(mode="basic"))
+            agents.append(HeuristicAgent(mode="basic", rules=RULES))
         elif n in ("heuristic(aggressive)", "heuristic aggressive", "heuristic - aggressive"):
             from agents.heuristic_agent import HeuristicAgent
             agents.append(HeuristicAgent(mode="aggressive"))
         elif n == "mcts":
             from agents.mcts_agent import MCTSAgent
-            agents.append(MCTSAgent(n_simulations=req.mcts_sims, n_determinizations=10))
+            agents.append(MCTSAgent(
+                n_simulations=req.mcts_sims, n_determinizations=10,
+                soft17_hit=RULES.soft17_hit, blackjack_pays=RULES.blackjack_pays,
+            ))
+        elif n == "expectimax":
+            from agents.expectimax_agent import ExpectimaxAgent
+            agents.append(ExpectimaxAgent(
+                soft17_hit=RULES.soft17_hit, blackjack_pays=RULES.blackjack_pays
+            ))
         elif n == "dnn":
+            from agents.dnn_agent import DNNAgent, shared_broker, weights_available
             model_path = req.dnn_model_path
-            if not Path(model_path).exists():
+            if not weights_available(model_path):
                 raise HTTPException(
                     status_code=400,
                     detail=f"DNN model not found at '{model_path}'. "
                            "Train the model first or deselect DNN.",
                 )
-            from agents.dnn_agent import DNNAgent
-            agents.append(DNNAgent(model_path=model_path))
+            if DNN_MAX_BATCH > 1:
+                # Decisions from concurrent sessions are batched into one forward pass
+                broker = shared_broker(model_path, max_batch_size=DNN_MAX_BATCH,
+                                       max_delay_ms=DNN_MAX_DELAY_MS, backend=DNN_BACKEND)
+                agents.append(DNNAgent(model_path=model_path, broker=broker))
+            else:
+                agents.append(DNNAgent(model_path=model_path, backend=DNN_BACKEND))
         else:
             raise HTTPException(status_code=400, detail=f"Unknown agent: '{name}'")
     return agents
 
 
+def _configure_models() -> None:
+    from agents.model_registry import registry
+    registry.max_models = max(DNN_MAX_MODELS, len(DNN_PRELOAD))
+    if DNN_PRELOAD:
+        from agents.dnn_agent import get_model
+        for path in DNN_PRELOAD:
+            get_model(path.strip())
+
+
 # ---------------------------------------------------------------------------
-# Serializer — converts dataclasses + Card NamedTuples → plain dicts/lists
+# Serializer — converts dataclasses + int card codes → plain dicts/lists
 # ---------------------------------------------------------------------------
 
-def _card(c: Any) -> str:
-    if isinstance(c, Card):
-        return str(c)
-    return str(c)
+def _card(c: int) -> str:
+    return str(card_from_code(c))
 
 
 def _serialize_step(s: AgentRoundStep) -> dict:
@@ -118,7 +171,7 @@ def _serialize_step(s: AgentRoundStep) -> dict:
         "dealer_upcard": _card(s.dealer_upcard),
         "legal_actions": s.legal_actions,
         "action_taken":  s.action_taken,
-        "reason":        s.reason,
+        "reason":        str(s.reason),
         "hand_value":    s.hand_value,
         "is_split_hand": s.is_split_hand,
         "hand_index":    s.hand_index,
@@ -189,8 +242,7 @@ def list_agents() -> dict:
     return {"agents": AVAILABLE_AGENTS}
 
 
-@app.post("/run")
-def run_session(req: RunRequest) -> dict:
+def _build_game(req: RunRequest) -> MultiAgentGame:
     if not req.agents:
         raise HTTPException(status_code=400, detail="Select at least one agent.")
     if len(req.agents) > 5:
@@ -198,12 +250,60 @@ def run_session(req: RunRequest) -> dict:
 
     agents = _build_agents(req)
 
-    game = MultiAgentGame(
+    return MultiAgentGame(
         agents=agents,
         num_rounds=req.num_rounds,
         starting_bankroll=req.starting_bankroll,
         base_bet=req.base_bet,
+        num_decks=RULES.num_decks,
         seed=req.seed,
+        soft17_hit=RULES.soft17_hit,
+        blackjack_pays=RULES.blackjack_pays,
     )
+
+
+@app.post("/run")
+def run_session(req: RunRequest) -> dict:
+    game = _build_game(req)
     result = game.run()
     return _serialize_result(result)
+
+
+def _frame(event: str, payload: dict, sse: bool) -> bytes:
+    data = json.dumps({"type": event, **payload}, ensure_ascii=False, separators=(",", ":"))
+    if sse:
+        return f"event: {event}\ndata: {data}\n\n".encode()
+    return (data + "\n").encode()
+
+
+@app.post("/run/stream")
+def run_session_stream(req: RunRequest, request: Request) -> StreamingResponse:
+    """
+    Stream a session while it is being played.
+
+    One ``round`` event per settled round (same shape as an entry of
+    ``rounds`` in /run), then a final ``result`` event with rounds_played,
+    starting_bankroll and the leaderboard.
+    """
+    game = _build_game(req)
+    sse = "text/event-stream" in request.headers.get("accept", "")
+
+    def events() -> Iterator[bytes]:
+        try:
+            for rec in game.iter_rounds():
+                yield _frame("round", {"round": _serialize_round(rec)}, sse)
+        except Exception as exc:  # headers are already sent; report in-band
+            yield _frame("error", {"detail": str(exc)}, sse)
+            return
+        yield _frame(
+            "result",
+            {
+                "rounds_played":     game.rounds_played,
+                "starting_bankroll": game.starting_bankroll,
+                "leaderboard":       [_serialize_entry(e) for e in game.leaderboard()],
+            },
+            sse,
+        )
+
+    media_type = "text/event-stream" if sse else "application/x-ndjson"
+    return StreamingResponse(events(), media_type=media_type)
@@ -0,0 +1,336 @@
+"""
+Vectorized NumPy batch simulator for fixed-policy agents.
+
+Plays many independent single-seat sessions (one shoe per lane) in
+lockstep: cards are dealt by array indexing, actions come from a compiled
+PolicyTable and dealer draws and settlement run on whole arrays. Rules match
+BlackjackGame (reshuffle below 25%, no resplit, no double after split,
+dealer natural ends the round), with an unlimited bankroll.
+
+Usage:
+    policy = PolicyTable.from_agent(HeuristicAgent(mode="basic"))
+    result = BatchSimulator(policy, seed=1).run(num_rounds=10_000_000)
+    print(result.house_edge, result.std_error)
+"""
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from engine.deck import ACE_RANK, NUM_RANKS, RANKS, RANK_VALUES, CardView
+from engine.game import ObservableState
+from engine.rules import (
+    ACTION_CODE,
+    ACTION_DOUBLE,
+    ACTION_HIT,
+    ACTION_SPLIT,
+    ACTION_STAND,
+)
+
+if TYPE_CHECKING:
+    from agents.base_agent import BaseAgent
+
+HIT = ACTION_CODE[ACTION_HIT]
+STAND = ACTION_CODE[ACTION_STAND]
+DOUBLE = ACTION_CODE[ACTION_DOUBLE]
+SPLIT = ACTION_CODE[ACTION_SPLIT]
+
+# Per-rank hard value (Ace = 1) and ace flag, indexed by rank index
+_RANK_HARD = np.array(
+    [1 if r == ACE_RANK else RANK_VALUES[RANKS[r]] for r in range(NUM_RANKS)],
+    dtype=np.int16,
+)
+_RANK_ACE = np.array([r == ACE_RANK for r in range(NUM_RANKS)], dtype=np.int16)
+_RANK_UP = np.array([RANK_VALUES[RANKS[r]] for r in range(NUM_RANKS)], dtype=np.int16)
+
+# Representative rank index for a card value 2..11
+_VALUE_RANK = {v: RANKS.index(str(v)) for v in range(2, 11)}
+_VALUE_RANK[11] = ACE_RANK
+
+
+# ---------------------------------------------------------------------------
+# Policy table
+# ---------------------------------------------------------------------------
+
+@dataclass
+class PolicyTable:
+    """
+    Compiled fixed policy.
+
+    totals[soft, total, upcard, can_double] -> action code (hit/stand/double)
+    splits[pair_rank, upcard]               -> True if the pair is split
+    Upcards are indexed by value (2..11, Ace = 11).
+    """
+    totals: np.ndarray   # int8, shape (2, 32, 12, 2)
+    splits: np.ndarray   # bool, shape (NUM_RANKS, 12)
+
+    @classmethod
+    def from_agent(cls, agent: "BaseAgent") -> "PolicyTable":
+        """
+        Tabulate an agent whose action depends only on its hand, the dealer
+        upcard and the legal actions (e.g. HeuristicAgent). Each table entry
+        is whatever the agent chooses for a representative hand.
+        """
+        totals = np.full((2, 32, 12, 2), STAND, dtype=np.int8)
+        splits = np.zeros((NUM_RANKS, 12), dtype=bool)
+
+        for up in range(2, 12):
+            up_code = _VALUE_RANK[up]
+            for can_double in (0, 1):
+                legal = [ACTION_HIT, ACTION_STAND]
+                if can_double:
+                    legal.append(ACTION_DOUBLE)
+                for total in range(4, 22):
+                    action = _query(agent, _hard_hand(total), up_code, legal)
+                    totals[0, total, up, can_double] = ACTION_CODE[action]
+                for total in range(12, 22):
+                    action = _query(agent, _soft_hand(total), up_code, legal)
+                    totals[1, total, up, can_double] = ACTION_CODE[action]
+
+            legal = [ACTION_HIT, ACTION_STAND, ACTION_DOUBLE, ACTION_SPLIT]
+            for rank in range(NUM_RANKS):
+                action = _query(agent, (rank, rank), up_code, legal)
+                splits[rank, up] = action == ACTION_SPLIT
+
+        return cls(totals=totals, splits=splits)
+
+
+def _hard_hand(total: int) -> tuple[int, ...]:
+    """Ace-free hand (as rank-index codes) with the given hard total, 4..21."""
+    if total == 21:
+        return (_VALUE_RANK[10], _VALUE_RANK[9], _VALUE_RANK[2])
+    high = min(10, total - 2)
+    return (_VALUE_RANK[high], _VALUE_RANK[total - high])
+
+
+def _soft_hand(total: int) -> tuple[int, ...]:
+    """Two-card soft hand A + x with the given total, 12..21."""
+    kicker = total - 11
+    return (ACE_RANK, ACE_RANK if kicker == 1 else _VALUE_RANK[kicker])
+
+
+def _query(agent: "BaseAgent", hand: tuple[int, ...], up_code: int, legal: list[str]) -> str:
+    state = ObservableState(
+        player_hand=hand,
+        dealer_upcard=up_code,
+        deck_cards_remaining=0,
+        bankroll=math.inf,
+        current_bet=1.0,
+        is_first_action=ACTION_DOUBLE in legal,
+        seen_cards=CardView([]),
+        round_num=0,
+    )
+    return agent.choose_action(state, list(legal))
+
+
+# ---------------------------------------------------------------------------
+# Batch simulator
+# ---------------------------------------------------------------------------
+
+@dataclass
+class BatchResult:
+    """Aggregate outcome of a batch run, in units of the base bet."""
+    rounds: int
+    total_payout: float
+    sum_sq_payout: float
+    wins: int
+    losses: int
+    pushes: int
+    blackjacks: int
+
+    @property
+    def mean_payout(self) -> float:
+        return self.total_payout / max(self.rounds, 1)
+
+    @property
+    def house_edge(self) -> float:
+        return -self.mean_payout
+
+    @property
+    def std_error(self) -> float:
+        n = max(self.rounds, 1)
+        var = self.sum_sq_payout / n - self.mean_payout ** 2
+        return math.sqrt(max(var, 0.0) / n)
+
+
+class BatchSimulator:
+    """
+    Plays ``num_shoes`` independent single-seat shoes in lockstep, one round
+    per lane per step, using a compiled PolicyTable.
+    """
+
+    def __init__(
+        self,
+        policy: PolicyTable,
+        num_decks: int = 6,
+        soft17_hit: bool = True,
+        blackjack_pays: float = 1.5,
+        reshuffle_threshold: float = 0.25,
+        seed: int | None = None,
+    ) -> None:
+        self.policy = policy
+        self.num_decks = num_decks
+        self.soft17_hit = soft17_hit
+        self.blackjack_pays = blackjack_pays
+        self.shoe_size = 52 * num_decks
+        # Same cut as Deck.is_low(): reshuffle once fewer cards than this remain
+        self.cut = self.shoe_size - reshuffle_threshold * self.shoe_size
+        self.rng = np.random.default_rng(seed)
+        self._template = np.repeat(
+            np.arange(NUM_RANKS, dtype=np.int8), 4 * num_decks
+        )
+
+    def run(self, num_rounds: int, num_shoes: int = 4096) -> BatchResult:
+        n = min(num_shoes, num_rounds)
+        shoes = self.rng.permuted(np.tile(self._template, (n, 1)), axis=1)
+        cursor = np.zeros(n, dtype=np.int64)
+
+        result = BatchResult(0, 0.0, 0.0, 0, 0, 0, 0)
+        remaining = num_rounds
+        while remaining > 0:
+            lanes = min(n, remaining)
+            low = np.flatnonzero(cursor[:lanes] > self.cut)
+            if low.size:
+                shoes[low] = self.rng.permuted(shoes[low], axis=1)
+                cursor[low] = 0
+            net, natural = self._play_round(shoes[:lanes], cursor[:lanes])
+            result.rounds += lanes
+            result.total_payout += float(net.sum())
+            result.sum_sq_payout += float(np.square(net).sum())
+            result.wins += int(np.count_nonzero(net > 0))
+            result.losses += int(np.count_nonzero(net < 0))
+            result.pushes += int(np.count_nonzero(net == 0))
+            result.blackjacks += int(np.count_nonzero(natural))
+            remaining -= lanes
+        return result
+
+    def _play_round(self, shoes: np.ndarray, cursor: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Play one round in every lane; return net payout per lane and player naturals."""
+        n, shoe_size = shoes.shape
+        lanes = np.arange(n)
+        totals_table = self.policy.totals
+        splits_table = self.policy.splits
+
+        def draw(idx: np.ndarray) -> np.ndarray:
+            # A lane that runs out mid-round reshuffles its full shoe, like Deck.deal
+            empty = idx[cursor[idx] >= shoe_size]
+            if empty.size:
+                shoes[empty] = self.rng.permuted(shoes[empty], axis=1)
+                cursor[empty] = 0
+            ranks = shoes[idx, cursor[idx]]
+            cursor[idx] += 1
+            return ranks
+
+        # Opening deal in BlackjackGame order: player, player, upcard, hole
+        p1, p2, up_r, hole_r = (draw(lanes) for _ in range(4))
+        up = _RANK_UP[up_r]
+
+        # Player hand slots (slot 1 only used after a split)
+        hard = np.zeros((2, n), dtype=np.int16)
+        aces = np.zeros((2, n), dtype=np.int16)
+        ncards = np.zeros((2, n), dtype=np.int16)
+        bet = np.ones((2, n), dtype=np.int16)
+        hard[0] = _RANK_HARD[p1] + _RANK_HARD[p2]
+        aces[0] = _RANK_ACE[p1] + _RANK_ACE[p2]
+        ncards[0] = 2
+        split = np.zeros(n, dtype=bool)
+
+        d_hard = _RANK_HARD[up_r] + _RANK_HARD[hole_r]
+        d_aces = _RANK_ACE[up_r] + _RANK_ACE[hole_r]
+
+        player_bj = _natural(hard[0], aces[0])
+        dealer_bj = _natural(d_hard, d_aces)
+        resolved = player_bj | dealer_bj
+
+        # Player decisions, hand slot by hand slot
+        pair = p1 == p2
+        for slot in (0, 1):
+            active = ~resolved if slot == 0 else split.copy()
+            first = active.copy()
+            while True:
+                idx = np.flatnonzero(active)
+                if not idx.size:
+                    break
+                h = hard[slot, idx]
+                a = aces[slot, idx]
+                soft = (a > 0) & (h <= 11)
+                total = np.where(soft, h + 10, h)
+                can_double = first[idx] & ~split[idx]
+                action = totals_table[soft.astype(np.int8), total, up[idx], can_double.astype(np.int8)]
+                if slot == 0:
+                    can_split = can_double & pair[idx]
+                    action = np.where(
+                        can_split & splits_table[p1[idx], up[idx]], SPLIT, action
+                    )
+
+                # Split: each half keeps one card and receives a new one
+                sp = idx[action == SPLIT]
+                if sp.size:
+                    split[sp] = True
+                    one_hard, one_ace = _RANK_HARD[p1[sp]], _RANK_ACE[p1[sp]]
+                    for s in (0, 1):
+                        r = draw(sp)
+                        hard[s, sp] = one_hard + _RANK_HARD[r]
+                        aces[s, sp] = one_ace + _RANK_ACE[r]
+                        ncards[s, sp] = 2
+
+                draw_idx = idx[(action == HIT) | (action == DOUBLE)]
+                if draw_idx.size:
+                    r = draw(draw_idx)
+                    hard[slot, draw_idx] += _RANK_HARD[r]
+                    aces[slot, draw_idx] += _RANK_ACE[r]
+                    ncards[slot, draw_idx] += 1
+                    first[draw_idx] = False
+
+                dbl = idx[action == DOUBLE]
+                bet[slot, dbl] = 2
+                active[idx[(action == STAND) | (action == DOUBLE)]] = False
+                active[draw_idx[hard[slot, draw_idx] > 21]] = False
+
+        # Dealer draws for every unresolved lane (even if the player busted)
+        playing = np.flatnonzero(~resolved)
+        while playing.size:
+            h, a = d_hard[playing], d_aces[playing]
+            soft = (a > 0) & (h <= 11)
+            total = np.where(soft, h + 10, h)
+            hits = (total < 17) | ((total == 17) & soft & self.soft17_hit)
+            playing = playing[hits]
+            if playing.size:
+                r = draw(playing)
+                d_hard[playing] += _RANK_HARD[r]
+                d_aces[playing] += _RANK_ACE[r]
+        d_total = _best_total(d_hard, d_aces)
+
+        # Settlement, mirroring compute_payout for each hand slot
+        net = np.zeros(n, dtype=np.float64)
+        for slot in (0, 1):
+            in_play = ~resolved if slot == 0 else split
+            p_total = _best_total(hard[slot], aces[slot])
+            slot_bj = (ncards[slot] == 2) & (p_total == 21)
+            unit = np.where(
+                p_total > 21, -1.0,
+                np.where(
+                    slot_bj, self.blackjack_pays,
+                    np.where(
+                        (d_total > 21) | (p_total > d_total), 1.0,
+                        np.where(p_total == d_total, 0.0, -1.0),
+                    ),
+                ),
+            )
+            net += np.where(in_play, unit * bet[slot], 0.0)
+
+        net += np.where(player_bj & ~dealer_bj, self.blackjack_pays, 0.0)
+        net -= np.where(dealer_bj & ~player_bj, 1.0, 0.0)
+        return net, player_bj
+
+
+def _best_total(hard: np.ndarray, aces: np.ndarray) -> np.ndarray:
+    return np.where((aces > 0) & (hard <= 11), hard + 10, hard)
+
+
+def _natural(hard: np.ndarray, aces: np.ndarray) -> np.ndarray:
+    """Two-card 21: an Ace plus a ten-value card."""
+    return (aces == 1) & (hard == 11)
@@ -0,0 +1,188 @@
+"""
+Dealer outcome probabilities.
+
+Answers "given this upcard and this shoe composition, how does the dealer
+finish?" by enumerating every dealer draw sequence under the
+``dealer_should_hit`` rules instead of simulating hands. Results are
+memoized on (upcard value, composition key, rules), so repeated queries from
+agents and analytics are a cache lookup.
+
+Two draw models:
+- infinite deck (default): draws are independent with the composition's
+  per-value probabilities; the composition is bucketed so nearby shoes share
+  a table.
+- exact: draws deplete the given finite shoe, without replacement.
+
+Usage:
+    dist = dealer_distribution(upcard, deck.view.rank_counts, exact=True)
+    dist[BUST], dist[DEALER_TOTALS.index(20)], dist[BLACKJACK]
+    ev = stand_ev(18, dist)
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from functools import lru_cache
+
+from engine.deck import ACE_RANK, VALUE_OF, CardCode, HandState
+from engine.rules import dealer_should_hit
+
+# Distribution layout: P(17), P(18), P(19), P(20), P(21), P(bust), P(blackjack)
+DEALER_TOTALS = (17, 18, 19, 20, 21)
+BUST = 5
+BLACKJACK = 6
+NUM_OUTCOMES = 7
+
+# Card values 2..11 (ace as 11); composition keys are indexed by value - 2
+CARD_VALUES = tuple(range(2, 12))
+
+# One representative card code per value, for driving HandState
+_CODE_OF_VALUE = tuple(
+    ACE_RANK if v == 11 else VALUE_OF.index(v) for v in CARD_VALUES
+)
+
+# Infinite-deck compositions are bucketed to this many cards
+BUCKET_CARDS = 104
+
+
+def value_counts(counts: Sequence[int]) -> tuple[int, ...]:
+    """Collapse per-rank unseen counts (13) to per-value counts (10)."""
+    by_value = [0] * len(CARD_VALUES)
+    for rank, c in enumerate(counts):
+        by_value[VALUE_OF[rank] - 2] += c
+    return tuple(by_value)
+
+
+def composition_key(counts: Sequence[int], exact: bool = False) -> tuple[int, ...]:
+    """
+    Memo key for a per-rank composition: the per-value counts for the exact
+    model, or the per-value shares scaled to ``BUCKET_CARDS`` otherwise.
+    An empty composition falls back to a full deck.
+    """
+    by_value = value_counts(counts)
+    total = sum(by_value)
+    if total <= 0:
+        by_value = tuple(16 if v == 10 else 4 for v in CARD_VALUES)
+        total = 52
+    if exact:
+        return by_value
+    return tuple(round(BUCKET_CARDS * c / total) for c in by_value)
+
+
+@lru_cache(maxsize=8192)
+def dealer_outcomes(
+    up_value: int,
+    key: tuple[int, ...],
+    soft17_hit: bool = True,
+    exact: bool = False,
+    no_blackjack: bool = False,
+) -> tuple[float, ...]:
+    """
+    Distribution of the dealer's final result for an upcard value (2..11)
+    and a composition key from ``composition_key``.
+
+    The hole card is drawn from the composition too. With ``no_blackjack``
+    the distribution is conditioned on the dealer not holding a natural
+    (the player is only asked to act after the peek), so P(blackjack) is 0.
+    """
+    counts = list(key)
+    dist = [0.0] * NUM_OUTCOMES
+    hand = HandState((_CODE_OF_VALUE[up_value - 2],))
+    memo: dict[tuple, list[float]] = {}
+
+    def finish(remaining: int) -> list[float]:
+        # Dealer draws until dealer_should_hit says stop
+        if hand.total > 21:
+            out = [0.0] * NUM_OUTCOMES
+            out[BUST] = 1.0
+            return out
+        if not dealer_should_hit(hand, soft17_hit):
+            out = [0.0] * NUM_OUTCOMES
+            out[hand.total - 17] = 1.0
+            return out
+        memo_key = (hand.total, hand.soft, tuple(counts)) if exact else (hand.total, hand.soft)
+        cached = memo.get(memo_key)
+        if cached is not None:
+            return cached
+        out = [0.0] * NUM_OUTCOMES
+        if remaining > 0:
+            for i, c in enumerate(counts):
+                if not c:
+                    continue
+                p = c / remaining
+                hand.add(_CODE_OF_VALUE[i])
+                if exact:
+                    counts[i] -= 1
+                    sub = finish(remaining - 1)
+                    counts[i] += 1
+                else:
+                    sub = finish(remaining)
+                hand.pop()
+                for j in range(NUM_OUTCOMES):
+                    out[j] += p * sub[j]
+        else:
+            # Shoe exhausted mid-hand: the dealer stands (counted as at least 17)
+            out[max(hand.total, 17) - 17] = 1.0
+        memo[memo_key] = out
+        return out
+
+    remaining = sum(counts)
+    hole_total = 0
+    for i, c in enumerate(counts):
+        if not c:
+            continue
+        hand.add(_CODE_OF_VALUE[i])
+        natural = hand.is_blackjack
+        if natural and no_blackjack:
+            hand.pop()
+            continue
+        hole_total += c
+        if natural:
+            dist[BLACKJACK] += c
+        else:
+            if exact:
+                counts[i] -= 1
+                sub = finish(remaining - 1)
+                counts[i] += 1
+            else:
+                sub = finish(remaining)
+            for j in range(NUM_OUTCOMES):
+                dist[j] += c * sub[j]
+        hand.pop()
+
+    if hole_total:
+        dist = [p / hole_total for p in dist]
+    return tuple(dist)
+
+
+def dealer_distribution(
+    upcard: CardCode,
+    counts: Sequence[int],
+    soft17_hit: bool = True,
+    exact: bool = False,
+    no_blackjack: bool = False,
+) -> tuple[float, ...]:
+    """
+    Dealer outcome distribution for an upcard code and the per-rank counts
+    of the unseen cards (e.g. ``ShoeView.rank_counts``; hole card included).
+    """
+    return dealer_outcomes(
+        VALUE_OF[upcard],
+        composition_key(counts, exact),
+        soft17_hit,
+        exact,
+        no_blackjack,
+    )
+
+
+def stand_ev(player_total: int, dist: Sequence[float]) -> float:
+    """
+    Expected net payout per unit bet of standing on a non-natural
+    ``player_total`` (<= 21) against a dealer distribution.
+    """
+    ev = dist[BUST] - dist[BLACKJACK]
+    for final, p in zip(DEALER_TOTALS, dist):
+        if player_total > final:
+            ev += p
+        elif player_total < final:
+            ev -= p
+    return ev
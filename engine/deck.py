@@ -1,7 +1,17 @@
-"""Standard 52-card deck for Blackjack."""
+"""
+Standard 52-card deck for Blackjack.
+
+Inside the engine a card is a small int code 0–51 (``suit * 13 + rank``, the
+same order as ``ALL_CARDS``). Rank, point value and ace-ness are precomputed
+per code, so hand evaluation is plain tuple indexing. ``Card`` objects are only
+built at the serialization boundary via ``card_from_code``.
+"""
 from __future__ import annotations
 
 import random
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import islice
 from typing import NamedTuple
 
 SUITS = ("hearts", "diamonds", "clubs", "spades")
@@ -43,33 +53,70 @@ ALL_CARDS: list[Card] = [
 CARD_INDEX: dict[Card, int] = {card: i for i, card in enumerate(ALL_CARDS)}
 INDEX_CARD: dict[int, Card] = {i: card for card, i in CARD_INDEX.items()}
 
+# ---------------------------------------------------------------------------
+# Integer card codes (engine representation)
+# ---------------------------------------------------------------------------
+
+CardCode = int
+
+NUM_RANKS = len(RANKS)
+ACE_RANK = RANKS.index("A")
+
+# Every card code, in canonical order (code == CARD_INDEX[card])
+ALL_CODES: tuple[CardCode, ...] = tuple(range(len(ALL_CARDS)))
+
+# Per-code lookup tables
+RANK_OF: tuple[int, ...] = tuple(c % NUM_RANKS for c in ALL_CODES)
+VALUE_OF: tuple[int, ...] = tuple(RANK_VALUES[RANKS[r]] for r in RANK_OF)
+IS_ACE: tuple[bool, ...] = tuple(r == ACE_RANK for r in RANK_OF)
+# Hi-Lo count tag: 2–6 = +1, 7–9 = 0, tens and Aces = -1
+HILO_OF: tuple[int, ...] = tuple(
+    1 if v <= 6 else (-1 if v >= 10 else 0) for v in VALUE_OF
+)
+
+
+def card_code(card: Card) -> CardCode:
+    """Encode a ``Card`` as its int code."""
+    return CARD_INDEX[card]
+
 
-def hand_value(hand: list[Card]) -> int:
+def card_from_code(code: CardCode) -> Card:
+    """Decode an int code back into a ``Card`` (serialization boundary only)."""
+    return ALL_CARDS[code]
+
+
+def hand_value(hand: Iterable[CardCode]) -> int:
     """
     Compute optimal Blackjack hand value.
     Aces count as 11, reduced to 1 to avoid bust.
     """
-    total = sum(c.value() for c in hand)
-    aces = sum(1 for c in hand if c.is_ace())
+    total = 0
+    aces = 0
+    for c in hand:
+        total += VALUE_OF[c]
+        aces += IS_ACE[c]
     while total > 21 and aces > 0:
         total -= 10
         aces -= 1
     return total
 
 
-def is_bust(hand: list[Card]) -> bool:
+def is_bust(hand: Iterable[CardCode]) -> bool:
     return hand_value(hand) > 21
 
 
-def is_blackjack(hand: list[Card]) -> bool:
+def is_blackjack(hand: list[CardCode]) -> bool:
     """Natural blackjack: exactly 2 cards totalling 21."""
     return len(hand) == 2 and hand_value(hand) == 21
 
 
-def is_soft(hand: list[Card]) -> bool:
+def is_soft(hand: Iterable[CardCode]) -> bool:
     """True if hand contains an Ace counted as 11."""
-    total = sum(c.value() for c in hand)
-    aces = sum(1 for c in hand if c.is_ace())
+    total = 0
+    aces = 0
+    for c in hand:
+        total += VALUE_OF[c]
+        aces += IS_ACE[c]
     # Soft if we have aces and at least one is counted as 11
     while total > 21 and aces > 0:
         total -= 10
@@ -77,27 +124,262 @@ def is_soft(hand: list[Card]) -> bool:
     return aces > 0  # at least one ace still counts as 11
 
 
+class HandState:
+    """
+    Incrementally evaluated Blackjack hand.
+
+    Keeps the hard total (every Ace as 1), ace count, best total, soft flag
+    and pair flag up to date as cards are added or removed, so every query
+    is O(1) instead of a rescan of the card list.
+    """
+
+    __slots__ = ("cards", "hard_total", "aces", "total", "soft", "pair")
+
+    def __init__(self, cards: Iterable[CardCode] = ()) -> None:
+        self.cards: list[CardCode] = []
+        self.hard_total = 0
+        self.aces = 0
+        self.total = 0
+        self.soft = False
+        self.pair = False
+        for code in cards:
+            self.add(code)
+
+    def add(self, code: CardCode) -> None:
+        self.cards.append(code)
+        if IS_ACE[code]:
+            self.aces += 1
+            self.hard_total += 1
+        else:
+            self.hard_total += VALUE_OF[code]
+        self._update()
+
+    def pop(self) -> CardCode:
+        """Remove and return the last card added (undo of ``add``)."""
+        code = self.cards.pop()
+        if IS_ACE[code]:
+            self.aces -= 1
+            self.hard_total -= 1
+        else:
+            self.hard_total -= VALUE_OF[code]
+        self._update()
+        return code
+
+    def _update(self) -> None:
+        # At most one Ace can count as 11 without busting
+        if self.aces and self.hard_total <= 11:
+            self.total = self.hard_total + 10
+            self.soft = True
+        else:
+            self.total = self.hard_total
+            self.soft = False
+        cards = self.cards
+        self.pair = len(cards) == 2 and RANK_OF[cards[0]] == RANK_OF[cards[1]]
+
+    def copy(self) -> "HandState":
+        clone = HandState.__new__(HandState)
+        clone.cards = self.cards[:]
+        clone.hard_total = self.hard_total
+        clone.aces = self.aces
+        clone.total = self.total
+        clone.soft = self.soft
+        clone.pair = self.pair
+        return clone
+
+    @property
+    def is_bust(self) -> bool:
+        return self.total > 21
+
+    @property
+    def is_blackjack(self) -> bool:
+        """Natural blackjack: exactly 2 cards totalling 21."""
+        return self.total == 21 and len(self.cards) == 2
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    def __iter__(self) -> Iterator[CardCode]:
+        return iter(self.cards)
+
+    def __getitem__(self, index: int) -> CardCode:
+        return self.cards[index]
+
+    def __repr__(self) -> str:
+        return f"HandState({[str(ALL_CARDS[c]) for c in self.cards]}, total={self.total})"
+
+
+class CardView(Sequence[CardCode]):
+    """
+    Frozen, zero-copy view of the first ``len`` cards of an append-only list.
+
+    The engine only ever appends to seen-card and hand lists (a new shoe or
+    a split starts a new list), so a view taken at decision time keeps
+    showing exactly the cards that were visible then.
+    """
+
+    __slots__ = ("_cards", "_len")
+
+    def __init__(self, cards: list[CardCode]) -> None:
+        self._cards = cards
+        self._len = len(cards)
+
+    def __len__(self) -> int:
+        return self._len
+
+    @property
+    def base(self) -> list[CardCode]:
+        """The underlying list (shared; read only ``base[:len(view)]``)."""
+        return self._cards
+
+    def __iter__(self) -> Iterator[CardCode]:
+        return islice(self._cards, self._len)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._cards[:self._len][index]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("CardView index out of range")
+        return self._cards[index]
+
+    def __repr__(self) -> str:
+        return f"CardView({[str(ALL_CARDS[c]) for c in self]})"
+
+
 class Deck:
-    """One or more standard 52-card decks shuffled together (shoe)."""
+    """
+    One or more standard 52-card decks shuffled together (shoe).
+
+    The shoe is a preallocated byte array of card codes. Cards at
+    ``[0:cursor]`` are still undealt and are dealt from the top end, so
+    dealing only moves the cursor and reshuffling restores the canonical
+    order and shuffles in place — no per-shuffle allocation.
+
+    The deck also tracks the composition of the cards the table has not
+    seen yet (per-rank counts, Hi-Lo running count and true count). A card
+    dealt face down stays unseen until ``reveal`` is called for it; revealing
+    a card dealt before a reshuffle leaves the new shoe's counts alone.
+    """
 
     def __init__(self, num_decks: int = 6, seed: int | None = None) -> None:
         self.num_decks = num_decks
         self.rng = random.Random(seed)
-        self._cards: list[Card] = []
+        self._template = array("B", ALL_CODES * num_decks)
+        self._buf = array("B", self._template)
+        self._pos = 0
+        self._full_counts = array("i", [4 * num_decks] * NUM_RANKS)
+        self._rank_counts = array("i", self._full_counts)
+        self._unseen = 0
+        self._running_count = 0
+        # Face-down cards of the current shoe not yet revealed
+        self._face_down: list[CardCode] = []
+        self.view = ShoeView(self)
         self.shuffle()
 
     def shuffle(self) -> None:
-        self._cards = ALL_CARDS * self.num_decks
-        self.rng.shuffle(self._cards)
+        # Restoring canonical order first keeps seeded shoes reproducible
+        self._buf[:] = self._template
+        self.rng.shuffle(self._buf)
+        self._pos = len(self._buf)
+        self._rank_counts[:] = self._full_counts
+        self._unseen = self._pos
+        self._running_count = 0
+        self._face_down.clear()
 
-    def deal(self) -> Card:
-        if not self._cards:
+    def deal(self, face_down: bool = False) -> CardCode:
+        if not self._pos:
             self.shuffle()
-        return self._cards.pop()
+        self._pos -= 1
+        code = self._buf[self._pos]
+        if face_down:
+            self._face_down.append(code)
+        else:
+            self._see(code)
+        return code
+
+    def deal_n(self, n: int) -> list[CardCode]:
+        """Deal ``n`` face-up cards at once, in dealing order."""
+        pos = self._pos
+        if n > pos:
+            return [self.deal() for _ in range(n)]
+        self._pos = pos - n
+        cards = self._buf[pos - n:pos].tolist()
+        cards.reverse()
+        for code in cards:
+            self._see(code)
+        return cards
+
+    def reveal(self, code: CardCode) -> None:
+        """
+        Mark a face-down card as seen by the table. A card dealt before the
+        last reshuffle is no longer part of the shoe's counts and is ignored.
+        """
+        try:
+            self._face_down.remove(code)
+        except ValueError:
+            return
+        self._see(code)
+
+    def _see(self, code: CardCode) -> None:
+        self._rank_counts[RANK_OF[code]] -= 1
+        self._unseen -= 1
+        self._running_count += HILO_OF[code]
+
+    def peek(self, n: int = 1) -> list[CardCode]:
+        """Next ``n`` cards in dealing order, without dealing them."""
+        pos = self._pos
+        cards = self._buf[max(pos - n, 0):pos].tolist()
+        cards.reverse()
+        return cards
+
+    def remaining(self) -> memoryview:
+        """
+        Read-only, zero-copy view of the undealt cards.
+        The next card to be dealt is the *last* element. The view is live:
+        take a fresh one after dealing or shuffling.
+        """
+        return memoryview(self._buf)[:self._pos].toreadonly()
 
     def cards_remaining(self) -> int:
-        return len(self._cards)
+        return self._pos
 
     def is_low(self, threshold: float = 0.25) -> bool:
         """True when shoe is below threshold fraction of original size."""
-        return self.cards_remaining() < threshold * 52 * self.num_decks
+        return self._pos < threshold * 52 * self.num_decks
+
+
+class ShoeView:
+    """
+    Read-only window onto a Deck's unseen-card composition, safe to hand to
+    agents. All values are live: they reflect the shoe at the time of access.
+    """
+
+    __slots__ = ("_deck", "_counts")
+
+    def __init__(self, deck: Deck) -> None:
+        self._deck = deck
+        self._counts = memoryview(deck._rank_counts).toreadonly()
+
+    @property
+    def num_decks(self) -> int:
+        return self._deck.num_decks
+
+    @property
+    def rank_counts(self) -> memoryview:
+        """Unseen cards per rank index (``RANKS`` order); includes any face-down card."""
+        return self._counts
+
+    @property
+    def cards_unseen(self) -> int:
+        return self._deck._unseen
+
+    @property
+    def running_count(self) -> int:
+        """Hi-Lo running count of every card seen since the last shuffle."""
+        return self._deck._running_count
+
+    @property
+    def true_count(self) -> float:
+        """Running count per unseen deck."""
+        return self._deck._running_count * 52 / max(self._deck._unseen, 1)
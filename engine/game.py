@@ -1,11 +1,20 @@
 """Blackjack game engine — single-player vs dealer, multi-round sessions."""
 from __future__ import annotations
 
+import math
 import random
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
-from engine.deck import Card, Deck, hand_value, is_bust, is_blackjack
+from engine.deck import (
+    NUM_RANKS,
+    RANK_OF,
+    CardCode,
+    CardView,
+    Deck,
+    HandState,
+    ShoeView,
+)
 from engine.rules import (
     ACTION_DOUBLE,
     ACTION_HIT,
@@ -28,8 +37,8 @@ if TYPE_CHECKING:
 class RoundRecord:
     """Complete record of one played round."""
     round_num: int
-    player_hands: list[list[Card]]      # may have 2 hands after split
-    dealer_hand: list[Card]
+    player_hands: list[list[CardCode]]   # may have 2 hands after split
+    dealer_hand: list[CardCode]
     bets: list[float]                    # one per player hand
     payouts: list[float]                 # net payout per hand
     actions_taken: list[list[str]]       # actions per hand
@@ -41,19 +50,34 @@ class ObservableState:
     """
     What the agent can observe at decision time.
     (Dealer hole card is hidden — only upcard visible.)
+
+    ``seen_cards`` is a frozen view shared with the engine, not a copy.
     """
-    player_hand: list[Card]              # current hand being played
-    dealer_upcard: Card                  # dealer's face-up card (hole card hidden)
+    player_hand: tuple[CardCode, ...]    # current hand being played
+    dealer_upcard: CardCode              # dealer's face-up card (hole card hidden)
     deck_cards_remaining: int
     bankroll: float
     current_bet: float
     is_first_action: bool               # True if no cards added to hand yet
-    seen_cards: list[Card]              # all cards visible so far this shoe
+    seen_cards: CardView                # all cards visible so far this shoe
     round_num: int
     # Split context
     is_split_hand: bool = False
     split_hand_index: int = 0
     num_split_hands: int = 1
+    # Live unseen-card composition of the shoe (read-only)
+    shoe: ShoeView | None = None
+
+    def unseen_counts(self) -> list[int]:
+        """Per-rank counts of the cards not seen yet (includes the hole card)."""
+        if self.shoe is not None:
+            return self.shoe.rank_counts.tolist()
+        # No live shoe view: rebuild from the seen cards
+        shoe_size = self.deck_cards_remaining + len(self.seen_cards) + 1
+        counts = [4 * max(1, math.ceil(shoe_size / 52))] * NUM_RANKS
+        for c in self.seen_cards:
+            counts[RANK_OF[c]] -= 1
+        return [max(c, 0) for c in counts]
 
 
 @dataclass
@@ -111,7 +135,7 @@ class BlackjackGame:
         self.blackjack_pays = blackjack_pays
         self.deck = Deck(num_decks=num_decks, seed=seed)
         self.bankroll = starting_bankroll
-        self.seen_cards: list[Card] = []
+        self.seen_cards: list[CardCode] = []
         self.round_records: list[RoundRecord] = []
         self.round_num = 0
 
@@ -122,7 +146,7 @@ class BlackjackGame:
                 break
             if self.deck.is_low():
                 self.deck.shuffle()
-                self.seen_cards.clear()
+                self.seen_cards = []  # earlier CardViews keep the old shoe
             self._play_round()
 
         return SessionResult(
@@ -133,32 +157,37 @@ class BlackjackGame:
             rounds=self.round_records,
         )
 
-    def _deal_card(self) -> Card:
+    def _deal_card(self) -> CardCode:
         card = self.deck.deal()
         self.seen_cards.append(card)
         return card
 
+    def _reveal(self, card: CardCode) -> None:
+        self.deck.reveal(card)
+        self.seen_cards.append(card)
+
     def _play_round(self) -> None:
         self.round_num += 1
 
         # Deal initial hands
-        player_hand: list[Card] = [self._deal_card(), self._deal_card()]
-        dealer_hand: list[Card] = [self._deal_card(), self._deal_card()]
-        # Dealer hole card not added to seen until reveal
-        self.seen_cards.pop()   # remove hole card from seen (hidden)
-        hole_card = dealer_hand[1]
+        cards = self.deck.deal_n(3)
+        # Dealer hole card dealt face down, not added to seen until reveal
+        hole_card = self.deck.deal(face_down=True)
+        player_hand = HandState(cards[:2])
+        dealer_hand = HandState((cards[2], hole_card))
+        self.seen_cards.extend(cards)
         dealer_upcard = dealer_hand[0]
 
         bet = self.base_bet
         self.bankroll -= bet
 
         # Check for dealer natural (check before player acts)
-        dealer_natural = is_blackjack(dealer_hand)
+        dealer_natural = dealer_hand.is_blackjack
 
         # Check for player natural
-        if is_blackjack(player_hand):
+        if player_hand.is_blackjack:
             # Reveal hole card
-            self.seen_cards.append(hole_card)
+            self._reveal(hole_card)
             if dealer_natural:
                 payout = 0.0  # push
             else:
@@ -166,8 +195,8 @@ class BlackjackGame:
             self.bankroll += bet + payout
             rec = RoundRecord(
                 round_num=self.round_num,
-                player_hands=[player_hand[:]],
-                dealer_hand=dealer_hand[:],
+                player_hands=[player_hand.cards],
+                dealer_hand=dealer_hand.cards,
                 bets=[bet],
                 payouts=[payout],
                 actions_taken=[["blackjack"]],
@@ -178,7 +207,7 @@ class BlackjackGame:
 
         # If dealer has natural, player loses immediately
         if dealer_natural:
-            self.seen_cards.append(hole_card)
+            self._reveal(hole_card)
             payout = -bet
             self.bankroll += bet + payout  # == bankroll unchanged (-bet net)
             # Actually bankroll -= bet was done above, and payout = -bet means net is -bet
@@ -197,8 +226,8 @@ class BlackjackGame:
             self.bankroll -= payout  # undo the mistaken add
             rec = RoundRecord(
                 round_num=self.round_num,
-                player_hands=[player_hand[:]],
-                dealer_hand=dealer_hand[:],
+                player_hands=[player_hand.cards],
+                dealer_hand=dealer_hand.cards,
                 bets=[bet],
                 payouts=[-bet],
                 actions_taken=[["dealer_blackjack"]],
@@ -208,7 +237,7 @@ class BlackjackGame:
             return
 
         # Player actions (possibly multiple hands after split)
-        hands: list[list[Card]] = [player_hand]
+        hands: list[HandState] = [player_hand]
         bets: list[float] = [bet]
         actions_taken: list[list[str]] = [[]]
         hand_idx = 0
@@ -220,7 +249,7 @@ class BlackjackGame:
             hand_actions = actions_taken[hand_idx]
 
             is_first_action = True
-            while not is_bust(current_hand):
+            while not current_hand.is_bust:
                 legal = get_legal_actions(
                     current_hand,
                     bankroll=self.bankroll,
@@ -233,17 +262,18 @@ class BlackjackGame:
                     break
 
                 obs = ObservableState(
-                    player_hand=current_hand[:],
+                    player_hand=tuple(current_hand.cards),
                     dealer_upcard=dealer_upcard,
                     deck_cards_remaining=self.deck.cards_remaining(),
                     bankroll=self.bankroll,
                     current_bet=current_bet,
                     is_first_action=is_first_action,
-                    seen_cards=self.seen_cards[:],
+                    seen_cards=CardView(self.seen_cards),
                     round_num=self.round_num,
                     is_split_hand=is_split_hand,
                     split_hand_index=hand_idx,
                     num_split_hands=len(hands),
+                    shoe=self.deck.view,
                 )
 
                 action = self.agent.choose_action(obs, legal)
@@ -252,20 +282,20 @@ class BlackjackGame:
                 if action == ACTION_STAND:
                     break
                 elif action == ACTION_HIT:
-                    current_hand.append(self._deal_card())
+                    current_hand.add(self._deal_card())
                     is_first_action = False
                 elif action == ACTION_DOUBLE:
                     self.bankroll -= current_bet
                     bets[hand_idx] = current_bet * 2
                     current_bet = bets[hand_idx]
-                    current_hand.append(self._deal_card())
+                    current_hand.add(self._deal_card())
                     break  # exactly one more card on double
                 elif action == ACTION_SPLIT:
                     # Split into two hands
                     card1, card2 = current_hand[0], current_hand[1]
                     self.bankroll -= current_bet  # extra bet for second hand
-                    hands[hand_idx] = [card1, self._deal_card()]
-                    new_hand = [card2, self._deal_card()]
+                    hands[hand_idx] = HandState((card1, self._deal_card()))
+                    new_hand = HandState((card2, self._deal_card()))
                     hands.insert(hand_idx + 1, new_hand)
                     bets.insert(hand_idx + 1, current_bet)
                     actions_taken.insert(hand_idx + 1, [])
@@ -279,9 +309,9 @@ class BlackjackGame:
             hand_idx += 1
 
         # Dealer plays (reveal hole card)
-        self.seen_cards.append(hole_card)
+        self._reveal(hole_card)
         while dealer_should_hit(dealer_hand, self.soft17_hit):
-            dealer_hand.append(self._deal_card())
+            dealer_hand.add(self._deal_card())
 
         # Compute payouts
         payouts: list[float] = []
@@ -292,8 +322,8 @@ class BlackjackGame:
 
         rec = RoundRecord(
             round_num=self.round_num,
-            player_hands=hands,
-            dealer_hand=dealer_hand[:],
+            player_hands=[h.cards for h in hands],
+            dealer_hand=dealer_hand.cards,
             bets=bets,
             payouts=payouts,
             actions_taken=actions_taken,
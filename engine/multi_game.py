@@ -8,14 +8,21 @@ Each agent has its own bankroll and bet independently.
 Usage:
     game = MultiAgentGame(agents=[agent1, agent2, ...], ...)
     result = game.run()
+
+    # or stream rounds as they settle
+    for record in game.iter_rounds():
+        ...
+    standings = game.leaderboard()
 """
 from __future__ import annotations
 
+import asyncio
 import random
-from dataclasses import dataclass, field
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass, field, replace
 from typing import TYPE_CHECKING
 
-from engine.deck import Card, Deck, hand_value, is_bust, is_blackjack
+from engine.deck import CardCode, CardView, Deck, HandState
 from engine.rules import (
     ACTION_DOUBLE,
     ACTION_HIT,
@@ -28,7 +35,7 @@ from engine.rules import (
 from engine.game import ObservableState, RoundRecord
 
 if TYPE_CHECKING:
-    from agents.base_agent import BaseAgent
+    from agents.base_agent import BaseAgent, Reason
 
 
 # ---------------------------------------------------------------------------
@@ -40,11 +47,11 @@ class AgentRoundStep:
     """One decision taken by one agent."""
     agent_name: str
     agent_index: int
-    player_hand: list[Card]
-    dealer_upcard: Card
+    player_hand: list[CardCode]
+    dealer_upcard: CardCode
     legal_actions: list[str]
     action_taken: str
-    reason: str
+    reason: Reason                       # str or LazyReason; str() to read
     hand_value: int
     is_split_hand: bool = False
     hand_index: int = 0
@@ -55,7 +62,7 @@ class AgentRoundResult:
     """Full outcome for one agent in one round."""
     agent_name: str
     agent_index: int
-    player_hands: list[list[Card]]
+    player_hands: list[list[CardCode]]
     bets: list[float]
     payouts: list[float]           # net payout per hand
     actions_taken: list[list[str]]
@@ -83,8 +90,8 @@ class AgentRoundResult:
 class MultiRoundRecord:
     """Complete record of one round across all agents."""
     round_num: int
-    dealer_hand: list[Card]
-    dealer_upcard: Card
+    dealer_hand: list[CardCode]
+    dealer_upcard: CardCode
     agent_results: list[AgentRoundResult]   # one per agent (same order as agents list)
 
 
@@ -133,6 +140,14 @@ class MultiSessionResult:
 # Multi-agent game
 # ---------------------------------------------------------------------------
 
+# How much per-round detail MultiAgentGame keeps
+RECORD_FULL = "full"              # round records with every decision step (API replay)
+RECORD_ROUNDS = "rounds"          # round records without decision steps
+RECORD_AGGREGATES = "aggregates"  # leaderboard statistics only, constant memory
+
+RECORD_LEVELS = (RECORD_FULL, RECORD_ROUNDS, RECORD_AGGREGATES)
+
+
 class MultiAgentGame:
     """
     Runs N agents against the same dealer each round.
@@ -140,6 +155,10 @@ class MultiAgentGame:
     All agents share the same shoe (cards are dealt sequentially:
     player1 cards, player2 cards, ..., dealer cards). This mirrors
     real casino play where one shoe serves all seats.
+
+    ``record_level`` controls what is kept: "full" (default) records every
+    decision step, "rounds" keeps round records without steps and
+    "aggregates" keeps only running leaderboard statistics.
     """
 
     def __init__(
@@ -152,7 +171,12 @@ class MultiAgentGame:
         seed: int | None = None,
         soft17_hit: bool = True,
         blackjack_pays: float = 1.5,
+        record_level: str = RECORD_FULL,
     ) -> None:
+        if record_level not in RECORD_LEVELS:
+            raise ValueError(
+                f"record_level must be one of {RECORD_LEVELS}, got '{record_level}'"
+            )
         self.agents = agents
         self.num_rounds = num_rounds
         self.starting_bankroll = starting_bankroll
@@ -161,11 +185,56 @@ class MultiAgentGame:
         self.blackjack_pays = blackjack_pays
         self.deck = Deck(num_decks=num_decks, seed=seed)
         self.bankrolls: list[float] = [starting_bankroll] * len(agents)
-        self.seen_cards: list[Card] = []
+        self.seen_cards: list[CardCode] = []
+        self.record_level = record_level
         self.round_records: list[MultiRoundRecord] = []
         self.round_num = 0
+        self.rounds_played = 0
+        # Running per-agent statistics, updated as each round settles
+        self._stats: list[AgentLeaderboardEntry] = [
+            AgentLeaderboardEntry(
+                name=agent.name(),
+                agent_index=i,
+                starting_bankroll=starting_bankroll,
+                final_bankroll=starting_bankroll,
+            )
+            for i, agent in enumerate(agents)
+        ]
 
     def run(self) -> MultiSessionResult:
+        for rec in self._rounds():
+            if rec is not None:
+                self.round_records.append(rec)
+
+        return MultiSessionResult(
+            rounds_played=self.rounds_played,
+            starting_bankroll=self.starting_bankroll,
+            rounds=self.round_records,
+            leaderboard=self.leaderboard(),
+        )
+
+    def iter_rounds(self) -> Iterator[MultiRoundRecord]:
+        """
+        Play the session lazily, yielding each round as soon as it is settled.
+
+        Records are not kept in ``round_records``; ``leaderboard()`` reflects
+        every round yielded so far. Stop iterating to end the session early.
+        """
+        if self.record_level == RECORD_AGGREGATES:
+            raise ValueError("iter_rounds() needs record_level 'full' or 'rounds'")
+        for rec in self._rounds():
+            yield rec
+
+    async def aiter_rounds(self) -> AsyncIterator[MultiRoundRecord]:
+        """Async ``iter_rounds``: each round is played in a worker thread."""
+        rounds = self.iter_rounds()
+        while True:
+            rec = await asyncio.to_thread(next, rounds, None)
+            if rec is None:
+                return
+            yield rec
+
+    def _rounds(self) -> Iterator[MultiRoundRecord | None]:
         for agent in self.agents:
             agent.reset()
 
@@ -180,55 +249,56 @@ class MultiAgentGame:
 
             if self.deck.is_low():
                 self.deck.shuffle()
-                self.seen_cards.clear()
+                self.seen_cards = []  # earlier CardViews keep the old shoe
 
-            self._play_round()
+            yield self._play_round()
 
-        leaderboard = self._build_leaderboard()
-        return MultiSessionResult(
-            rounds_played=len(self.round_records),
-            starting_bankroll=self.starting_bankroll,
-            rounds=self.round_records,
-            leaderboard=leaderboard,
-        )
-
-    def _deal_card(self) -> Card:
+    def _deal_card(self) -> CardCode:
         card = self.deck.deal()
         self.seen_cards.append(card)
         return card
 
-    def _play_round(self) -> None:
+    def _play_round(self) -> MultiRoundRecord | None:
         self.round_num += 1
         n = len(self.agents)
 
         # Deal initial hands: each agent gets 2 cards, dealer gets 2 cards
-        player_hands: list[list[Card]] = []
-        for _ in range(n):
-            player_hands.append([self._deal_card(), self._deal_card()])
-
-        dealer_hand: list[Card] = [self._deal_card(), self._deal_card()]
-        # Hide hole card from seen
-        self.seen_cards.pop()
-        hole_card = dealer_hand[1]
+        cards = self.deck.deal_n(2 * n + 1)
+        # Hole card is dealt face down and hidden from seen
+        hole_card = self.deck.deal(face_down=True)
+        player_hands: list[HandState] = [
+            HandState(cards[2 * k:2 * k + 2]) for k in range(n)
+        ]
+        dealer_hand = HandState((cards[-1], hole_card))
+        self.seen_cards.extend(cards)
         dealer_upcard = dealer_hand[0]
 
-        dealer_natural = is_blackjack(dealer_hand)
+        dealer_natural = dealer_hand.is_blackjack
+        record = self.record_level != RECORD_AGGREGATES
+        record_steps = self.record_level == RECORD_FULL
         agent_results: list[AgentRoundResult] = []
+        # Live hands and bets per agent, settled once the dealer has played
+        # (empty for seats already settled)
+        seat_hands: list[list[HandState]] = [[] for _ in range(n)]
+        seat_bets: list[list[float]] = [[] for _ in range(n)]
+        # Per-seat outcome for the running statistics
+        nets = [0.0] * n
+        naturals = [False] * n
 
         for i, agent in enumerate(self.agents):
             if self.bankrolls[i] < self.base_bet:
                 # Agent is broke — record a skip
-                result = AgentRoundResult(
-                    agent_name=agent.name(),
-                    agent_index=i,
-                    player_hands=[player_hands[i][:]],
-                    bets=[0.0],
-                    payouts=[0.0],
-                    actions_taken=[["broke"]],
-                    bankroll_after=self.bankrolls[i],
-                    steps=[],
-                )
-                agent_results.append(result)
+                if record:
+                    agent_results.append(AgentRoundResult(
+                        agent_name=agent.name(),
+                        agent_index=i,
+                        player_hands=[player_hands[i].cards],
+                        bets=[0.0],
+                        payouts=[0.0],
+                        actions_taken=[["broke"]],
+                        bankroll_after=self.bankrolls[i],
+                        steps=[],
+                    ))
                 continue
 
             bet = self.base_bet
@@ -238,43 +308,45 @@ class MultiAgentGame:
             player_hand = player_hands[i]
 
             # Natural blackjack check
-            if is_blackjack(player_hand):
+            if player_hand.is_blackjack:
                 if dealer_natural:
                     payout = 0.0
                 else:
                     payout = bet * self.blackjack_pays
                 self.bankrolls[i] += bet + payout
-                result = AgentRoundResult(
-                    agent_name=agent.name(),
-                    agent_index=i,
-                    player_hands=[player_hand[:]],
-                    bets=[bet],
-                    payouts=[payout],
-                    actions_taken=[["blackjack"]],
-                    bankroll_after=self.bankrolls[i],
-                    steps=steps,
-                )
-                agent_results.append(result)
+                nets[i] = payout
+                naturals[i] = True
+                if record:
+                    agent_results.append(AgentRoundResult(
+                        agent_name=agent.name(),
+                        agent_index=i,
+                        player_hands=[player_hand.cards],
+                        bets=[bet],
+                        payouts=[payout],
+                        actions_taken=[["blackjack"]],
+                        bankroll_after=self.bankrolls[i],
+                        steps=steps,
+                    ))
                 continue
 
             if dealer_natural:
-                # Player loses
-                self.bankrolls[i] += 0  # bet already removed
-                result = AgentRoundResult(
-                    agent_name=agent.name(),
-                    agent_index=i,
-                    player_hands=[player_hand[:]],
-                    bets=[bet],
-                    payouts=[-bet],
-                    actions_taken=[["dealer_blackjack"]],
-                    bankroll_after=self.bankrolls[i],
-                    steps=steps,
-                )
-                agent_results.append(result)
+                # Player loses; the bet is already removed
+                nets[i] = -bet
+                if record:
+                    agent_results.append(AgentRoundResult(
+                        agent_name=agent.name(),
+                        agent_index=i,
+                        player_hands=[player_hand.cards],
+                        bets=[bet],
+                        payouts=[-bet],
+                        actions_taken=[["dealer_blackjack"]],
+                        bankroll_after=self.bankrolls[i],
+                        steps=steps,
+                    ))
                 continue
 
             # Normal play
-            hands: list[list[Card]] = [player_hand]
+            hands: list[HandState] = [player_hand]
             bets: list[float] = [bet]
             actions_taken: list[list[str]] = [[]]
             hand_idx = 0
@@ -286,7 +358,7 @@ class MultiAgentGame:
                 hand_actions = actions_taken[hand_idx]
                 is_first_action = True
 
-                while not is_bust(current_hand):
+                while not current_hand.is_bust:
                     legal = get_legal_actions(
                         current_hand,
                         bankroll=self.bankrolls[i],
@@ -299,53 +371,53 @@ class MultiAgentGame:
                         break
 
                     obs = ObservableState(
-                        player_hand=current_hand[:],
+                        player_hand=tuple(current_hand.cards),
                         dealer_upcard=dealer_upcard,
                         deck_cards_remaining=self.deck.cards_remaining(),
                         bankroll=self.bankrolls[i],
                         current_bet=current_bet,
                         is_first_action=is_first_action,
-                        seen_cards=self.seen_cards[:],
+                        seen_cards=CardView(self.seen_cards),
                         round_num=self.round_num,
                         is_split_hand=is_split,
                         split_hand_index=hand_idx,
                         num_split_hands=len(hands),
+                        shoe=self.deck.view,
                     )
 
                     action = agent.choose_action(obs, legal)
-                    reason = getattr(agent, "last_reason", "")
                     hand_actions.append(action)
 
-                    step = AgentRoundStep(
-                        agent_name=agent.name(),
-                        agent_index=i,
-                        player_hand=current_hand[:],
-                        dealer_upcard=dealer_upcard,
-                        legal_actions=list(legal),
-                        action_taken=action,
-                        reason=reason,
-                        hand_value=hand_value(current_hand),
-                        is_split_hand=is_split,
-                        hand_index=hand_idx,
-                    )
-                    steps.append(step)
+                    if record_steps:
+                        steps.append(AgentRoundStep(
+                            agent_name=agent.name(),
+                            agent_index=i,
+                            player_hand=current_hand.cards[:],
+                            dealer_upcard=dealer_upcard,
+                            legal_actions=list(legal),
+                            action_taken=action,
+                            reason=getattr(agent, "last_reason", ""),
+                            hand_value=current_hand.total,
+                            is_split_hand=is_split,
+                            hand_index=hand_idx,
+                        ))
 
                     if action == ACTION_STAND:
                         break
                     elif action == ACTION_HIT:
-                        current_hand.append(self._deal_card())
+                        current_hand.add(self._deal_card())
                         is_first_action = False
                     elif action == ACTION_DOUBLE:
                         self.bankrolls[i] -= current_bet
                         bets[hand_idx] = current_bet * 2
                         current_bet = bets[hand_idx]
-                        current_hand.append(self._deal_card())
+                        current_hand.add(self._deal_card())
                         break
                     elif action == ACTION_SPLIT:
                         card1, card2 = current_hand[0], current_hand[1]
                         self.bankrolls[i] -= current_bet
-                        hands[hand_idx] = [card1, self._deal_card()]
-                        new_hand = [card2, self._deal_card()]
+                        hands[hand_idx] = HandState((card1, self._deal_card()))
+                        new_hand = HandState((card2, self._deal_card()))
                         hands.insert(hand_idx + 1, new_hand)
                         bets.insert(hand_idx + 1, current_bet)
                         actions_taken.insert(hand_idx + 1, [])
@@ -357,94 +429,86 @@ class MultiAgentGame:
 
                 hand_idx += 1
 
-            # Compute payouts (dealer plays after all agents done)
-            payouts: list[float] = []
-            for h, b in zip(hands, bets):
-                # Note: dealer plays once after all agents act (below)
-                # For now store hands; payouts computed after dealer plays
-                payouts.append(0.0)  # placeholder
-
-            result = AgentRoundResult(
-                agent_name=agent.name(),
-                agent_index=i,
-                player_hands=hands,
-                bets=bets,
-                payouts=payouts,
-                actions_taken=actions_taken,
-                bankroll_after=0.0,  # filled after dealer plays
-                steps=steps,
-            )
-            agent_results.append(result)
+            # Payouts are computed once the dealer has played (below)
+            if record:
+                agent_results.append(AgentRoundResult(
+                    agent_name=agent.name(),
+                    agent_index=i,
+                    player_hands=[h.cards for h in hands],
+                    bets=bets,
+                    payouts=[0.0] * len(hands),
+                    actions_taken=actions_taken,
+                    bankroll_after=0.0,  # filled after dealer plays
+                    steps=steps,
+                ))
+            seat_hands[i] = hands
+            seat_bets[i] = bets
 
         # Dealer plays (reveal hole card, draw to 17+)
+        self.deck.reveal(hole_card)
         self.seen_cards.append(hole_card)
         while dealer_should_hit(dealer_hand, self.soft17_hit):
-            dealer_hand.append(self._deal_card())
+            dealer_hand.add(self._deal_card())
 
         # Finalize payouts now that dealer is done
-        for i, result in enumerate(agent_results):
-            if result.actions_taken == [["broke"]]:
-                continue
-            if result.actions_taken[0][0] in ("blackjack", "dealer_blackjack"):
-                # Already finalized above
-                continue
-
-            total_payout = 0.0
-            for hi, (h, b) in enumerate(zip(result.player_hands, result.bets)):
-                p = compute_payout(h, dealer_hand, b, self.blackjack_pays)
-                result.payouts[hi] = p
-                total_payout += p
+        for i in range(n):
+            if not seat_hands[i]:
+                continue                        # broke or settled on a natural
+            payouts = [
+                compute_payout(h, dealer_hand, b, self.blackjack_pays)
+                for h, b in zip(seat_hands[i], seat_bets[i])
+            ]
+            for b, p in zip(seat_bets[i], payouts):
                 self.bankrolls[i] += b + p
+            nets[i] = sum(payouts)
+            if record:
+                agent_results[i].payouts = payouts
 
-            result.bankroll_after = self.bankrolls[i]
+        self.rounds_played += 1
+        for i in range(n):
+            self._tally(self._stats[i], nets[i], self.bankrolls[i], naturals[i])
 
-        # Fix bankroll_after for blackjack/dealer_blackjack cases (already correct)
+        if not record:
+            return None
         for i, result in enumerate(agent_results):
-            if result.actions_taken[0][0] in ("blackjack", "dealer_blackjack"):
-                result.bankroll_after = self.bankrolls[i]
-
-        rec = MultiRoundRecord(
+            result.bankroll_after = self.bankrolls[i]
+        return MultiRoundRecord(
             round_num=self.round_num,
-            dealer_hand=dealer_hand[:],
+            dealer_hand=dealer_hand.cards,
             dealer_upcard=dealer_upcard,
             agent_results=agent_results,
         )
-        self.round_records.append(rec)
 
-    def _build_leaderboard(self) -> list[AgentLeaderboardEntry]:
-        entries: list[AgentLeaderboardEntry] = []
-        for i, agent in enumerate(self.agents):
-            entry = AgentLeaderboardEntry(
-                name=agent.name(),
-                agent_index=i,
-                starting_bankroll=self.starting_bankroll,
-                final_bankroll=self.bankrolls[i],
-            )
-            for rec in self.round_records:
-                if i >= len(rec.agent_results):
-                    continue
-                ar = rec.agent_results[i]
-                net = ar.net_payout
-                entry.total_payout += net
-
-                # Detect blackjack
-                bj = any("blackjack" in acts for acts in ar.actions_taken
-                         if acts and acts[0] == "blackjack")
-                if bj:
-                    entry.blackjacks += 1
-
-                if net > 0:
-                    entry.wins += 1
-                    entry.points += 3
-                    if bj:
-                        entry.points += 2  # blackjack bonus
-                elif net == 0:
-                    entry.ties += 1
-                    entry.points += 1
-                else:
-                    entry.losses += 1
-
-            entries.append(entry)
+    @staticmethod
+    def _tally(
+        entry: AgentLeaderboardEntry,
+        net: float,
+        bankroll_after: float,
+        blackjack: bool,
+    ) -> None:
+        """Fold one settled round into an agent's running statistics."""
+        entry.total_payout += net
+        entry.final_bankroll = bankroll_after
+
+        if blackjack:
+            entry.blackjacks += 1
+
+        if net > 0:
+            entry.wins += 1
+            entry.points += 3
+            if blackjack:
+                entry.points += 2  # blackjack bonus
+        elif net == 0:
+            entry.ties += 1
+            entry.points += 1
+        else:
+            entry.losses += 1
+
+    def leaderboard(self) -> list[AgentLeaderboardEntry]:
+        """Current standings, sorted best first (snapshot of the running stats)."""
+        entries = [replace(entry) for entry in self._stats]
+        for i, entry in enumerate(entries):
+            entry.final_bankroll = self.bankrolls[i]
 
         # Sort by points descending, then by win rate as tiebreaker
         entries.sort(key=lambda e: (e.points, e.win_rate, e.net_profit), reverse=True)
@@ -1,7 +1,7 @@
 """Blackjack rules: actions, payouts, dealer logic."""
 from __future__ import annotations
 
-from engine.deck import Card, hand_value, is_bust, is_blackjack
+from engine.deck import VALUE_OF, CardCode, HandState
 
 # Player actions
 ACTION_HIT = "hit"
@@ -11,9 +11,12 @@ ACTION_SPLIT = "split"
 
 ALL_ACTIONS = (ACTION_HIT, ACTION_STAND, ACTION_DOUBLE, ACTION_SPLIT)
 
+# Integer action codes (position in ALL_ACTIONS) for table-driven policies
+ACTION_CODE: dict[str, int] = {a: i for i, a in enumerate(ALL_ACTIONS)}
+
 
 def get_legal_actions(
-    hand: list[Card],
+    hand: HandState,
     bankroll: float,
     current_bet: float,
     can_double: bool = True,
@@ -27,7 +30,7 @@ def get_legal_actions(
     - DOUBLE: legal on first action if player can afford it.
     - SPLIT: legal on first action if both cards share the same rank and player can afford it.
     """
-    if is_bust(hand):
+    if hand.total > 21:
         return []
 
     actions = [ACTION_HIT, ACTION_STAND]
@@ -38,8 +41,7 @@ def get_legal_actions(
     if (
         is_first_action
         and can_split
-        and len(hand) == 2
-        and hand[0].rank == hand[1].rank
+        and hand.pair
         and bankroll >= current_bet
     ):
         actions.append(ACTION_SPLIT)
@@ -47,26 +49,25 @@ def get_legal_actions(
     return actions
 
 
-def dealer_should_hit(hand: list[Card], soft17_hit: bool = True) -> bool:
+def dealer_should_hit(hand: HandState, soft17_hit: bool = True) -> bool:
     """
     Standard casino dealer rules:
     - Dealer hits on hard 16 or less.
     - Dealer hits on soft 17 if soft17_hit is True (common rule).
     - Dealer stands on hard 17+.
     """
-    val = hand_value(hand)
+    val = hand.total
     if val < 17:
         return True
     if val == 17 and soft17_hit:
         # Check if soft 17
-        from engine.deck import is_soft
-        return is_soft(hand)
+        return hand.soft
     return False
 
 
 def compute_payout(
-    player_hand: list[Card],
-    dealer_hand: list[Card],
+    player_hand: HandState,
+    dealer_hand: HandState,
     bet: float,
     blackjack_pays: float = 1.5,
 ) -> float:
@@ -78,11 +79,11 @@ def compute_payout(
     - Push: 0.
     - Loss: -bet.
     """
-    player_bj = is_blackjack(player_hand)
-    dealer_bj = is_blackjack(dealer_hand)
+    player_bj = player_hand.is_blackjack
+    dealer_bj = dealer_hand.is_blackjack
 
-    player_val = hand_value(player_hand)
-    dealer_val = hand_value(dealer_hand)
+    player_val = player_hand.total
+    dealer_val = dealer_hand.total
 
     player_bust = player_val > 21
     dealer_bust = dealer_val > 21
@@ -110,6 +111,6 @@ def compute_payout(
         return -bet
 
 
-def upcard_value(dealer_upcard: Card) -> int:
+def upcard_value(dealer_upcard: CardCode) -> int:
     """Dealer upcard value as seen by players (Ace = 11)."""
-    return dealer_upcard.value()
+    return VALUE_OF[dealer_upcard]
@@ -0,0 +1,189 @@
+"""
+Process-parallel multi-agent tournaments.
+
+A long session is split into independent shards of ``rounds_per_shard``
+rounds. Each shard is a fresh MultiAgentGame (new shoe, new bankrolls, fresh
+agents) running in aggregates mode. Shard seeds are derived from the session
+seed with NumPy's SeedSequence, so the merged result depends only on the seed
+and the shard size — never on how many workers ran it. Agents that can
+open their own process pool (``use_pool``, e.g. root-parallel MCTS) are
+built with it off, so they run the same search in-process inside a shard.
+Agents that take the table rules (``rules``, ``soft17_hit``,
+``blackjack_pays``) get the session's unless their spec sets them.
+
+Usage:
+    tournament = ParallelTournament(
+        agent_specs=[(HeuristicAgent, {"mode": "basic"}), (MCTSAgent, {"n_simulations": 200})],
+        num_rounds=1_000_000,
+        seed=42,
+    )
+    result = tournament.run()
+"""
+from __future__ import annotations
+
+import inspect
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from engine.multi_game import (
+    RECORD_AGGREGATES,
+    AgentLeaderboardEntry,
+    MultiAgentGame,
+    MultiSessionResult,
+)
+
+if TYPE_CHECKING:
+    from agents.base_agent import BaseAgent
+
+# (agent class, constructor kwargs). Classes must be importable by workers.
+AgentSpec = tuple["type[BaseAgent]", dict[str, Any]]
+
+
+def _build_agent(spec: AgentSpec, seed: int, game_kwargs: dict[str, Any]) -> "BaseAgent":
+    cls, kwargs = spec
+    kwargs = dict(kwargs)
+    params = inspect.signature(cls).parameters
+    if "seed" in params:
+        kwargs.setdefault("seed", seed)
+    # Rule-aware agents play the shard's rules unless the spec says otherwise
+    for name in ("soft17_hit", "blackjack_pays"):
+        if name in params:
+            kwargs.setdefault(name, game_kwargs[name])
+    if "rules" in params:
+        from agents.strategy_table import RuleSet
+        kwargs.setdefault("rules", RuleSet(
+            num_decks=game_kwargs["num_decks"],
+            soft17_hit=game_kwargs["soft17_hit"],
+            blackjack_pays=game_kwargs["blackjack_pays"],
+        ))
+    if "use_pool" in params:
+        # The shard is the unit of parallelism: agents search in-process,
+        # both to avoid nested pools and to stay worker-count independent
+        kwargs["use_pool"] = False
+    return cls(**kwargs)
+
+
+def _run_shard(
+    agent_specs: list[AgentSpec],
+    num_rounds: int,
+    game_kwargs: dict[str, Any],
+    seeds: list[int],
+) -> tuple[int, list[AgentLeaderboardEntry]]:
+    """Play one shard; return rounds played and per-agent stats in seat order."""
+    agents = [_build_agent(spec, s, game_kwargs) for spec, s in zip(agent_specs, seeds[1:])]
+    game = MultiAgentGame(
+        agents=agents,
+        num_rounds=num_rounds,
+        seed=seeds[0],
+        record_level=RECORD_AGGREGATES,
+        **game_kwargs,
+    )
+    result = game.run()
+    entries = sorted(result.leaderboard, key=lambda e: e.agent_index)
+    return result.rounds_played, entries
+
+
+class ParallelTournament:
+    """
+    Runs a large multi-agent session as independent shards of
+    ``rounds_per_shard`` rounds on a process pool and merges the
+    leaderboard statistics exactly.
+
+    Every shard starts from ``starting_bankroll``; the merged final bankroll is
+    the starting bankroll plus the summed net payout of all shards.
+    """
+
+    def __init__(
+        self,
+        agent_specs: list[AgentSpec],
+        num_rounds: int,
+        rounds_per_shard: int = 1000,
+        starting_bankroll: float = 1000.0,
+        base_bet: float = 10.0,
+        num_decks: int = 6,
+        seed: int | None = None,
+        soft17_hit: bool = True,
+        blackjack_pays: float = 1.5,
+        max_workers: int | None = None,
+    ) -> None:
+        if rounds_per_shard < 1:
+            raise ValueError(f"rounds_per_shard must be >= 1, got {rounds_per_shard}")
+        self.agent_specs = agent_specs
+        self.num_rounds = num_rounds
+        self.rounds_per_shard = rounds_per_shard
+        self.starting_bankroll = starting_bankroll
+        self.max_workers = max_workers
+        self.seed_seq = np.random.SeedSequence(seed)
+        self.game_kwargs: dict[str, Any] = {
+            "starting_bankroll": starting_bankroll,
+            "base_bet": base_bet,
+            "num_decks": num_decks,
+            "soft17_hit": soft17_hit,
+            "blackjack_pays": blackjack_pays,
+        }
+
+    def shard_plan(self) -> list[tuple[int, list[int]]]:
+        """(rounds, seeds) per shard; seeds[0] seeds the shoe, seeds[1:] the agents."""
+        num_shards = math.ceil(self.num_rounds / self.rounds_per_shard)
+        plan = []
+        for k in range(num_shards):
+            # Same child as seed_seq.spawn() would give, without advancing it
+            child = np.random.SeedSequence(
+                self.seed_seq.entropy, spawn_key=self.seed_seq.spawn_key + (k,)
+            )
+            rounds = min(self.rounds_per_shard, self.num_rounds - k * self.rounds_per_shard)
+            seeds = child.generate_state(1 + len(self.agent_specs)).tolist()
+            plan.append((rounds, seeds))
+        return plan
+
+    def run(self) -> MultiSessionResult:
+        plan = self.shard_plan()
+        n = len(plan)
+        args = (
+            [self.agent_specs] * n,
+            [rounds for rounds, _ in plan],
+            [self.game_kwargs] * n,
+            [seeds for _, seeds in plan],
+        )
+        if self.max_workers == 1:
+            shards = list(map(_run_shard, *args))
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                # map() yields in submission order, so the merge is order-stable
+                shards = list(pool.map(_run_shard, *args, chunksize=max(1, n // 64)))
+        return self._merge(shards)
+
+    def _merge(
+        self, shards: list[tuple[int, list[AgentLeaderboardEntry]]]
+    ) -> MultiSessionResult:
+        rounds_played = 0
+        merged: list[AgentLeaderboardEntry] = []
+        for shard_rounds, entries in shards:
+            rounds_played += shard_rounds
+            if not merged:
+                merged = [
+                    replace(e, wins=0, losses=0, ties=0, blackjacks=0,
+                            total_payout=0.0, points=0,
+                            final_bankroll=self.starting_bankroll)
+                    for e in entries
+                ]
+            for total, e in zip(merged, entries):
+                total.wins += e.wins
+                total.losses += e.losses
+                total.ties += e.ties
+                total.blackjacks += e.blackjacks
+                total.points += e.points
+                total.total_payout += e.total_payout
+                total.final_bankroll += e.final_bankroll - e.starting_bankroll
+
+        merged.sort(key=lambda e: (e.points, e.win_rate, e.net_profit), reverse=True)
+        return MultiSessionResult(
+            rounds_played=rounds_played,
+            starting_bankroll=self.starting_bankroll,
+            rounds=[],
+            leaderboard=merged,
+        )
@@ -1,6 +1,6 @@
-import type { RunConfig, SessionResult } from '../types/session';
+import type { Round, RunConfig, SessionResult, StreamEvent } from '../types/session';
 
-// Local dev: Vite proxies /health, /agents, /run → http://localhost:8000 (see vite.config.ts)
+// Local dev: Vite proxies /health, /agents, /run, /run/stream → http://localhost:8000 (see vite.config.ts)
 // Production: set VITE_API_URL to your backend Vercel URL in the Vercel dashboard
 const BASE = (import.meta as any).env?.VITE_API_URL ?? '';
 
@@ -33,6 +33,23 @@ async function fetchWithTimeout(
   }
 }
 
+/** Builds a user-friendly Error from a non-ok response. */
+async function errorFromResponse(r: Response): Promise<Error> {
+  let msg = `Server error (${r.status})`;
+  try {
+    const text = await r.text();
+    const parsed = JSON.parse(text);
+    msg = parsed.detail ?? parsed.message ?? (text || msg);
+  } catch {
+    // keep status-code message
+  }
+  // Map common status codes to user-friendly messages
+  if (r.status === 422) msg = `Invalid configuration: ${msg}`;
+  else if (r.status === 500) msg = 'The simulation server encountered an error. Try again.';
+  else if (r.status === 503) msg = 'Server is unavailable. Try again in a moment.';
+  return new Error(msg);
+}
+
 /** Active run controller — cancelled if a second run is triggered before the first completes. */
 let activeRunController: AbortController | null = null;
 
@@ -69,21 +86,7 @@ export async function runSession(config: RunConfig): Promise<SessionResult> {
       signal: controller.signal,
     });
 
-    if (!r.ok) {
-      let msg = `Server error (${r.status})`;
-      try {
-        const text = await r.text();
-        const parsed = JSON.parse(text);
-        msg = parsed.detail ?? parsed.message ?? (text || msg);
-      } catch {
-        // keep status-code message
-      }
-      // Map common status codes to user-friendly messages
-      if (r.status === 422) msg = `Invalid configuration: ${msg}`;
-      else if (r.status === 500) msg = 'The simulation server encountered an error. Try again.';
-      else if (r.status === 503) msg = 'Server is unavailable. Try again in a moment.';
-      throw new Error(msg);
-    }
+    if (!r.ok) throw await errorFromResponse(r);
 
     const data = await r.json();
     // Validate minimum shape before returning — guards against partial/malformed responses
@@ -107,3 +110,82 @@ export async function runSession(config: RunConfig): Promise<SessionResult> {
     }
   }
 }
+
+/**
+ * Streaming variant of runSession using /run/stream (NDJSON).
+ * Calls onRound for each round as soon as the server has played it and
+ * resolves with the complete session once the final leaderboard arrives.
+ * The timeout applies to the gap between chunks, not to the whole run.
+ */
+export async function runSessionStream(
+  config: RunConfig,
+  onRound: (round: Round) => void,
+): Promise<SessionResult> {
+  if (activeRunController) {
+    activeRunController.abort();
+  }
+  activeRunController = new AbortController();
+  const controller = activeRunController;
+  let timer = setTimeout(() => controller.abort(), TIMEOUT_MS);
+  const resetTimer = () => {
+    clearTimeout(timer);
+    timer = setTimeout(() => controller.abort(), TIMEOUT_MS);
+  };
+
+  try {
+    const r = await fetch(`${BASE}/run/stream`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json', Accept: 'application/x-ndjson' },
+      body: JSON.stringify(config),
+      signal: controller.signal,
+    });
+    if (!r.ok) throw await errorFromResponse(r);
+    if (!r.body) throw new Error('Received an unexpected response from the server.');
+
+    const rounds: Round[] = [];
+    const reader = r.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    for (;;) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      resetTimer();
+      buffer += decoder.decode(value, { stream: true });
+
+      let nl: number;
+      while ((nl = buffer.indexOf('\n')) >= 0) {
+        const line = buffer.slice(0, nl).trim();
+        buffer = buffer.slice(nl + 1);
+        if (!line) continue;
+
+        const event = JSON.parse(line) as StreamEvent;
+        if (event.type === 'round') {
+          rounds.push(event.round);
+          onRound(event.round);
+        } else if (event.type === 'result') {
+          return {
+            rounds_played:     event.rounds_played,
+            starting_bankroll: event.starting_bankroll,
+            rounds,
+            leaderboard:       event.leaderboard,
+          };
+        } else if (event.type === 'error') {
+          throw new Error('The simulation server encountered an error. Try again.');
+        }
+      }
+    }
+    throw new Error('The connection closed before the session finished. Try again.');
+  } catch (err: any) {
+    if (err?.name === 'AbortError') {
+      throw new Error('Request timed out — the server took too long to respond. Try again.');
+    }
+    if (err instanceof Error) throw err;
+    throw new Error('An unexpected error occurred. Try again.');
+  } finally {
+    clearTimeout(timer);
+    if (activeRunController === controller) {
+      activeRunController = null;
+    }
+  }
+}
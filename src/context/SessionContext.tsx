@@ -1,5 +1,5 @@
 import React, { createContext, useContext, useReducer, type ReactNode } from 'react';
-import type { SessionResult, RunConfig } from '../types/session';
+import type { Round, SessionResult, RunConfig } from '../types/session';
 
 // ---------------------------------------------------------------------------
 // State
@@ -12,6 +12,8 @@ export interface AppState {
   config:  RunConfig;
   session: SessionResult | null;
   error:   string | null;
+  /** True while rounds are still arriving from /run/stream. */
+  streaming: boolean;
 }
 
 const DEFAULT_CONFIG: RunConfig = {
@@ -29,6 +31,7 @@ const initialState: AppState = {
   config:  DEFAULT_CONFIG,
   session: null,
   error:   null,
+  streaming: false,
 };
 
 // ---------------------------------------------------------------------------
@@ -38,6 +41,7 @@ const initialState: AppState = {
 type Action =
   | { type: 'SET_CONFIG'; config: Partial<RunConfig> }
   | { type: 'START_LOADING' }
+  | { type: 'ROUND_RECEIVED'; round: Round }
   | { type: 'SESSION_LOADED'; session: SessionResult }
   | { type: 'SESSION_ERROR'; error: string }
   | { type: 'GO_TO_GAME' }
@@ -54,20 +58,41 @@ function reducer(state: AppState, action: Action): AppState {
       // Prevent re-entering loading state if already loading (double-submit guard)
       if (state.view === 'loading') return state;
       return { ...state, view: 'loading', error: null };
+    case 'ROUND_RECEIVED': {
+      // First streamed round: start the replay with a provisional session
+      if (state.view === 'loading') {
+        const session: SessionResult = {
+          rounds_played:     state.config.num_rounds,
+          starting_bankroll: state.config.starting_bankroll,
+          rounds:            [action.round],
+          leaderboard:       [],
+        };
+        return { ...state, session, view: 'game', error: null, streaming: true };
+      }
+      if (!state.streaming || !state.session) return state;
+      return { ...state, session: { ...state.session, rounds: [...state.session.rounds, action.round] } };
+    }
     case 'SESSION_LOADED':
-      // Only accept a result if we're still in the loading state (ignore stale responses)
-      if (state.view !== 'loading') return state;
-      return { ...state, session: action.session, view: 'game', error: null };
+      // Only accept a result for the run in progress (ignore stale responses)
+      if (state.view !== 'loading' && !state.streaming) return state;
+      return {
+        ...state,
+        session: action.session,
+        view: state.view === 'loading' ? 'game' : state.view,
+        error: null,
+        streaming: false,
+      };
     case 'SESSION_ERROR':
-      return { ...state, view: 'menu', error: action.error };
+      return { ...state, view: 'menu', error: action.error, streaming: false };
     case 'GO_TO_GAME':
       if (!state.session) return state;
       return { ...state, view: 'game' };
     case 'GO_TO_LEADERBOARD':
-      if (!state.session) return state;
+      // The leaderboard only exists once the stream has finished
+      if (!state.session || state.streaming) return state;
       return { ...state, view: 'leaderboard' };
     case 'GO_TO_MENU':
-      return { ...state, view: 'menu', session: null, error: null };
+      return { ...state, view: 'menu', session: null, error: null, streaming: false };
     default:
       return state;
   }
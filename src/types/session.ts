@@ -57,6 +57,15 @@ export interface SessionResult {
   leaderboard:       LeaderboardEntry[];
 }
 
+// ---------------------------------------------------------------------------
+// Streaming events from /run/stream (one JSON object per line)
+// ---------------------------------------------------------------------------
+
+export type StreamEvent =
+  | { type: 'round';  round: Round }
+  | { type: 'result'; rounds_played: number; starting_bankroll: number; leaderboard: LeaderboardEntry[] }
+  | { type: 'error';  detail: string };
+
 // ---------------------------------------------------------------------------
 // Replay event types
 // ---------------------------------------------------------------------------
@@ -97,6 +106,7 @@ export const AGENT_COLORS: Record<string, string> = {
   'Heuristic(basic)':      '#38bdf8',   // sky blue
   'Heuristic(aggressive)': '#fb923c',   // orange
   MCTS:                    '#a78bfa',   // violet
+  Expectimax:              '#f472b6',   // pink
   DNN:                     '#34d399',   // emerald
 };
 
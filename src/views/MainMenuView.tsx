@@ -1,6 +1,6 @@
 import { useEffect, useState } from 'react';
 import { useSession } from '../context/SessionContext';
-import { runSession } from '../api/client';
+import { runSessionStream } from '../api/client';
 import { AppHeader } from '../components/AppHeader';
 import { AGENT_COLORS } from '../types/session';
 
@@ -39,6 +39,13 @@ const ALL_AGENTS = [
     desc:        'Monte Carlo Tree Search — runs thousands of simulations per decision',
     personality: 'Thinks ten moves ahead. Computationally expensive. Rarely surprised.',
   },
+  {
+    id:          'Expectimax',
+    label:       'Expectimax',
+    tag:         'Exact',
+    desc:        'Computes the exact EV of every action over the live shoe composition',
+    personality: 'Counts every card and does the math to the last decimal. The ground truth.',
+  },
   {
     id:          'DNN',
     label:       'DNN',
@@ -93,7 +100,7 @@ export function MainMenuView() {
     setLoading(true);
     dispatch({ type: 'START_LOADING' });
     try {
-      const session = await runSession(cfg);
+      const session = await runSessionStream(cfg, round => dispatch({ type: 'ROUND_RECEIVED', round }));
       dispatch({ type: 'SESSION_LOADED', session });
     } catch (err: any) {
       if (err?.name === 'AbortError') return;
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Allow imports from project root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
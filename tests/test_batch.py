@@ -0,0 +1,15 @@
+from agents.heuristic_agent import HeuristicAgent
+from engine.batch import BatchSimulator, PolicyTable
+
+
+def test_shoe_exhausted_mid_round_reshuffles():
+    # A single deck with a 10% cut regularly runs out mid-round
+    sim = BatchSimulator(
+        PolicyTable.from_agent(HeuristicAgent()),
+        num_decks=1,
+        reshuffle_threshold=0.1,
+        seed=1,
+    )
+    result = sim.run(100_000)
+    assert result.rounds == 100_000
+    assert result.wins + result.losses + result.pushes == result.rounds
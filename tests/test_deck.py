@@ -0,0 +1,22 @@
+from engine.deck import Deck, RANK_OF
+
+
+def test_reveal_after_reshuffle_keeps_new_shoe_counts():
+    deck = Deck(num_decks=1, seed=3)
+    hole = deck.deal(face_down=True)
+    while deck.cards_remaining():
+        deck.deal()
+    deck.deal()  # empty shoe: reshuffles and deals from the new one
+    counts = list(deck.view.rank_counts)
+    running = deck.view.running_count
+    deck.reveal(hole)
+    assert list(deck.view.rank_counts) == counts
+    assert deck.view.running_count == running
+
+
+def test_reveal_counts_face_down_card():
+    deck = Deck(num_decks=1, seed=3)
+    hole = deck.deal(face_down=True)
+    before = deck.view.rank_counts[RANK_OF[hole]]
+    deck.reveal(hole)
+    assert deck.view.rank_counts[RANK_OF[hole]] == before - 1
@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+
+from agents import dnn_backends
+from agents.dnn_backends import (
+    BACKEND_EAGER,
+    BACKEND_INT8,
+    BACKEND_NUMPY,
+    BACKEND_ONNX,
+    BACKEND_TORCHSCRIPT,
+    build_backend,
+    check_parity,
+    compiled_forward,
+    reference_states,
+    select_backend,
+)
+from agents.model_registry import registry
+from agents.numpy_mlp import NumpyMLP
+
+
+@pytest.fixture(scope="module")
+def reference():
+    return reference_states(n=500)
+
+
+@pytest.fixture(scope="module")
+def model(reference):
+    torch = pytest.importorskip("torch")
+    from agents.dnn_agent import BlackjackMLP
+
+    torch.manual_seed(0)
+    model = BlackjackMLP()
+    # Give BatchNorm non-trivial running statistics before switching to eval
+    states = torch.from_numpy(reference[0])
+    with torch.no_grad():
+        for _ in range(5):
+            model(states)
+    model.eval()
+    model.requires_grad_(False)
+    return model
+
+
+def _random_mlp(seed=0):
+    rng = np.random.default_rng(seed)
+    dims = [192, 64, 4]
+    return NumpyMLP([(rng.normal(size=(i, o)), rng.normal(size=o)) for i, o in zip(dims, dims[1:])])
+
+
+class _StubModel:
+    """Torch-free stand-in for a BlackjackMLP; its backends are patched in."""
+
+
+@pytest.fixture
+def stub(monkeypatch, reference):
+    mlp = _random_mlp()
+    forwards = {
+        BACKEND_EAGER: mlp.forward,
+        BACKEND_NUMPY: NumpyMLP(mlp.layers).forward,       # same decisions
+        BACKEND_INT8: lambda states: -mlp.forward(states),  # different decisions
+    }
+
+    def build(model, backend, device="cpu"):
+        if backend not in forwards:
+            raise ImportError(f"{backend} is not installed")
+        return forwards[backend]
+
+    monkeypatch.setattr(dnn_backends, "build_backend", build)
+    monkeypatch.setattr(dnn_backends, "_default_reference", lambda: reference)
+    return _StubModel()
+
+
+def test_check_parity_counts_changed_decisions(reference):
+    mlp = _random_mlp()
+    assert check_parity(mlp, mlp.forward, reference=reference).identical
+    report = check_parity(mlp, lambda states: -mlp.forward(states), reference=reference)
+    assert report.mismatches > 0
+    assert not report.identical
+
+
+def test_compiled_forward_verifies_and_caches(stub):
+    forward = compiled_forward(stub, BACKEND_NUMPY)
+    assert compiled_forward(stub, BACKEND_NUMPY) is forward
+    with pytest.raises(ValueError, match="reference decisions"):
+        compiled_forward(stub, BACKEND_INT8)
+    with pytest.raises(ImportError):
+        compiled_forward(stub, BACKEND_ONNX)
+
+
+def test_select_backend_skips_missing_and_mismatched(stub):
+    assert select_backend(stub, (BACKEND_INT8, BACKEND_ONNX, BACKEND_NUMPY)) == BACKEND_NUMPY
+    assert select_backend(stub, (BACKEND_INT8, BACKEND_ONNX)) == BACKEND_EAGER
+
+
+def test_compiled_backends_dropped_on_eviction(stub, tmp_path, monkeypatch):
+    monkeypatch.setattr(registry, "max_models", 1)
+    registry.clear()
+    for name in ("a", "b"):
+        (tmp_path / name).write_text(name)
+    model = registry.get(tmp_path / "a", "stub", lambda path: stub)
+    compiled_forward(model, BACKEND_NUMPY)
+    assert model in dnn_backends._compiled
+    registry.get(tmp_path / "b", "stub", lambda path: _StubModel())    # evicts a
+    assert model not in dnn_backends._compiled
+    registry.clear()
+
+
+def test_numpy_weights_round_trip(tmp_path, reference):
+    mlp = _random_mlp()
+    mlp.save(tmp_path / "m.npz")
+    loaded = NumpyMLP.load(tmp_path / "m.npz")
+    assert check_parity(mlp, loaded.forward, reference=reference).identical
+
+
+@pytest.mark.parametrize("backend", [BACKEND_NUMPY, BACKEND_TORCHSCRIPT, BACKEND_ONNX])
+def test_backend_matches_eager(model, reference, backend):
+    if backend == BACKEND_ONNX:
+        pytest.importorskip("onnxruntime")
+        pytest.importorskip("onnx")
+    report = check_parity(model, build_backend(model, backend), backend, reference=reference)
+    assert report.identical, report
+    assert report.max_logit_diff < 1e-4
+
+
+def test_int8_is_only_used_when_identical(model):
+    forward = build_backend(model, BACKEND_INT8)
+    report = check_parity(model, forward, BACKEND_INT8)
+    if report.identical:
+        assert compiled_forward(model, BACKEND_INT8) is not None
+    else:
+        with pytest.raises(ValueError):
+            compiled_forward(model, BACKEND_INT8)
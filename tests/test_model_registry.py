@@ -0,0 +1,36 @@
+import gc
+import weakref
+
+import numpy as np
+
+from agents.dnn_agent import ACTION_DIM, STATE_DIM, get_model, shared_broker
+from agents.model_registry import registry
+from agents.numpy_mlp import NumpyMLP
+
+
+def _save_weights(path, seed):
+    rng = np.random.default_rng(seed)
+    NumpyMLP([
+        (rng.normal(size=(STATE_DIM, 8)), np.zeros(8)),
+        (rng.normal(size=(8, ACTION_DIM)), np.zeros(ACTION_DIM)),
+    ]).save(path)
+
+
+def test_evicted_model_is_freed_with_its_broker(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry, "max_models", 1)
+    registry.clear()
+    a, b = tmp_path / "a.npz", tmp_path / "b.npz"
+    _save_weights(a, 0)
+    _save_weights(b, 1)
+
+    broker = shared_broker(a, max_batch_size=4)
+    assert shared_broker(a, max_batch_size=4) is broker
+    weights = weakref.ref(get_model(a).layers[0][0])
+
+    shared_broker(b, max_batch_size=4)          # evicts a
+    # A broker still held keeps serving the evicted model
+    assert broker.infer(np.zeros(STATE_DIM, np.float32)).shape == (ACTION_DIM,)
+    del broker
+    gc.collect()
+    assert weights() is None
+    registry.clear()
@@ -0,0 +1,13 @@
+from agents.strategy_table import SHIPPED_DIR, RuleSet, generate_strategy, load_strategy
+
+
+def test_shipped_default_table_is_current():
+    rules = RuleSet()
+    shipped = (SHIPPED_DIR / f"{rules.key}.json").read_text()
+    assert shipped == generate_strategy(rules).to_json()
+
+
+def test_shipped_table_loads_without_generating(tmp_path):
+    table = load_strategy(RuleSet(num_decks=2, soft17_hit=False), cache_dir=tmp_path)
+    assert table.rules.num_decks == 2
+    assert not any(tmp_path.iterdir())
@@ -0,0 +1,23 @@
+from agents.heuristic_agent import HeuristicAgent
+from agents.mcts_agent import MCTSAgent
+from agents.random_agent import RandomAgent
+from engine.tournament import ParallelTournament
+
+
+def _leaderboard(max_workers):
+    tournament = ParallelTournament(
+        agent_specs=[
+            (HeuristicAgent, {"mode": "basic"}),
+            (RandomAgent, {}),
+            (MCTSAgent, {"n_simulations": 20, "n_workers": 2}),
+        ],
+        num_rounds=200,
+        rounds_per_shard=50,
+        seed=7,
+        max_workers=max_workers,
+    )
+    return tournament.run().leaderboard
+
+
+def test_result_independent_of_worker_count():
+    assert _leaderboard(max_workers=1) == _leaderboard(max_workers=2)
@@ -7,7 +7,7 @@ export default defineConfig({
   server: {
     port: 5173,
     proxy: {
-      // Forward /health, /agents, /run to the local FastAPI server
+      // Forward /health, /agents, /run (and /run/stream) to the local FastAPI server
       '/health': 'http://localhost:8000',
       '/agents': 'http://localhost:8000',
       '/run':    'http://localhost:8000',